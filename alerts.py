@@ -0,0 +1,102 @@
+from __future__ import annotations
+from asyncio import QueueFull
+from queue import Full
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from datastructures.intervaltree import IntervalTree
+
+
+class Alert(NamedTuple):
+    subscription: Subscription
+    symbol: str
+    price: float
+    timestamp: int
+
+
+class Subscription:
+    # A standing watch for symbol trading inside [low, high]. Each matching
+    # tick is passed to callback and/or put on queue, which may be any object
+    # with put_nowait, such as an asyncio.Queue or a queue.Queue.
+    __slots__ = ("id", "symbol", "low", "high", "callback", "queue")
+
+    def __init__(self, subscription_id: int, symbol: str, low: float, high: float,
+                 callback: Optional[Callable[[Alert], Any]], queue: Any):
+        self.id = subscription_id
+        self.symbol = symbol
+        self.low = low
+        self.high = high
+        self.callback = callback
+        self.queue = queue
+
+
+class AlertBook:
+    # Subscriptions indexed per symbol by their price range, so a tick finds
+    # every watch containing its price with one stab, O(log n + k), however
+    # many watches there are.
+    def __init__(self):
+        self._trees: Dict[str, IntervalTree] = {}
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._next_id = 0
+        self.dropped = 0  # alerts lost because a subscriber's queue was full
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def watches(self, symbol: str) -> bool:
+        return symbol in self._trees
+
+    def subscribe(self, symbol: str, low: float, high: float, callback: Optional[Callable[[Alert], Any]] = None,
+                  queue: Any = None) -> Subscription:
+        subscription, = self.subscribe_many([(symbol, low, high)], callback, queue)
+        return subscription
+
+    def subscribe_many(self, watches: Iterable[Tuple[str, float, float]], callback: Optional[Callable[[Alert], Any]] = None,
+                       queue: Any = None) -> List[Subscription]:
+        # Large batches go through IntervalTree.extend, which bulk-builds.
+        if callback is None and queue is None:
+            raise ValueError("a subscription needs a callback or a queue")
+        created: List[Subscription] = []
+        by_symbol: Dict[str, List[Tuple[float, float, Subscription]]] = {}
+        for symbol, low, high in watches:
+            if low > high:
+                raise ValueError(f"empty range [{low}, {high}]")
+            subscription = Subscription(self._next_id + len(created), symbol, low, high, callback, queue)
+            created.append(subscription)
+            by_symbol.setdefault(symbol, []).append((low, high, subscription))
+        self._next_id += len(created)
+        for symbol, intervals in by_symbol.items():
+            tree = self._trees.get(symbol)
+            if tree is None:
+                tree = self._trees[symbol] = IntervalTree()
+            tree.extend(intervals)
+        self._subscriptions.update((subscription.id, subscription) for subscription in created)
+        return created
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        subscription = self._subscriptions.pop(subscription_id, None)
+        if subscription is None:
+            return False
+        tree = self._trees[subscription.symbol]
+        tree.delete(subscription.low, subscription.high, subscription)
+        if not tree.size():
+            del self._trees[subscription.symbol]
+        return True
+
+    def fire(self, symbol: str, price: float, timestamp: int) -> int:
+        # Notifies every subscription on symbol whose range holds price;
+        # returns how many matched.
+        tree = self._trees.get(symbol)
+        if tree is None:
+            return 0
+        # Materialized first so a callback may unsubscribe without
+        # disturbing the traversal.
+        matched = list(tree.stab(price))
+        for subscription in matched:
+            alert = Alert(subscription, symbol, price, timestamp)
+            if subscription.callback is not None:
+                subscription.callback(alert)
+            if subscription.queue is not None:
+                try:
+                    subscription.queue.put_nowait(alert)
+                except (QueueFull, Full):
+                    self.dropped += 1
+        return len(matched)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Callable, Generic, List, Optional, Sequence, Tuple
+from datastructures.avltree import AVLTree
+from datastructures.iavltree import IAVLTree, K, V
+
+# Child index meaning "no node". Never index a buffer with it: array[-1] is valid.
+NIL = -1
+
+class ArrayAVLTree(IAVLTree[K, V], Generic[K, V]):
+    # Struct-of-arrays AVL tree for numeric keys. Node i is described by
+    # _keys[i], _values[i], _left[i], _right[i] and _heights[i]; slots freed
+    # by delete are recycled through _free before the buffers grow.
+    def __init__(self, starting_sequence: Optional[Sequence[Tuple[K, V]]] = None, typecode: str = "q", value_typecode: Optional[str] = None):
+        self._keys = array(typecode)
+        self._values = array(value_typecode) if value_typecode else []
+        self._left = array("i")
+        self._right = array("i")
+        self._heights = array("b")
+        self._free = array("i")
+        self._root = NIL
+        self._count = 0
+        if starting_sequence:
+            self._root = self._build(AVLTree._sorted_pairs(starting_sequence))
+
+    def _build(self, pairs: List[Tuple[K, V]]) -> int:
+        for key, value in pairs:
+            self._keys.append(key)
+            self._values.append(value)
+        self._left = array("i", [NIL]) * len(pairs)
+        self._right = array("i", [NIL]) * len(pairs)
+        self._heights = array("b", [1]) * len(pairs)
+        self._count = len(pairs)
+        return self._link_range(0, len(pairs))
+
+    def _link_range(self, lo: int, hi: int) -> int:
+        # Slots were appended in key order, so the subtree over [lo, hi) is
+        # rooted at its middle slot.
+        if lo >= hi:
+            return NIL
+        mid = (lo + hi) // 2
+        self._left[mid] = self._link_range(lo, mid)
+        self._right[mid] = self._link_range(mid + 1, hi)
+        self._update(mid)
+        return mid
+
+    def _new_node(self, key: K, value: V) -> int:
+        self._count += 1
+        if self._free:
+            index = self._free.pop()
+            self._keys[index] = key
+            self._values[index] = value
+            self._left[index] = NIL
+            self._right[index] = NIL
+            self._heights[index] = 1
+            return index
+        self._keys.append(key)
+        self._values.append(value)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._heights.append(1)
+        return len(self._keys) - 1
+
+    def _free_node(self, index: int) -> None:
+        self._count -= 1
+        if isinstance(self._values, list):
+            self._values[index] = None
+        self._free.append(index)
+
+    def insert(self, key: K, value: V) -> None:
+        if self._root == NIL:
+            self._root = self._new_node(key, value)
+            return
+        keys, left, right = self._keys, self._left, self._right
+        path: List[int] = []
+        node = self._root
+        while node != NIL:
+            path.append(node)
+            node = left[node] if key < keys[node] else right[node]
+        parent = path[-1]
+        if key < keys[parent]:
+            left[parent] = self._new_node(key, value)
+        else:
+            right[parent] = self._new_node(key, value)
+        self._rebalance_path(path)
+
+    def search(self, key: K) -> V | None:
+        keys, left, right = self._keys, self._left, self._right
+        node = self._root
+        while node != NIL:
+            node_key = keys[node]
+            if key == node_key:
+                return self._values[node]
+            node = left[node] if key < node_key else right[node]
+        return None
+
+    def delete(self, key: K) -> None:
+        keys, left, right = self._keys, self._left, self._right
+        path: List[int] = []
+        node = self._root
+        while node != NIL and key != keys[node]:
+            path.append(node)
+            node = left[node] if key < keys[node] else right[node]
+        if node == NIL:
+            return
+        if left[node] != NIL and right[node] != NIL:
+            path.append(node)
+            target = right[node]
+            while left[target] != NIL:
+                path.append(target)
+                target = left[target]
+            keys[node] = keys[target]
+            self._values[node] = self._values[target]
+            replacement = right[target]
+        else:
+            target = node
+            replacement = left[node] if left[node] != NIL else right[node]
+        self._replace_child(path[-1] if path else NIL, target, replacement)
+        self._free_node(target)
+        self._rebalance_path(path)
+
+    def _replace_child(self, parent: int, child: int, replacement: int) -> None:
+        if parent == NIL:
+            self._root = replacement
+        elif self._left[parent] == child:
+            self._left[parent] = replacement
+        else:
+            self._right[parent] = replacement
+
+    def _rebalance_path(self, path: List[int]) -> None:
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            height = self._heights[node]
+            self._update(node)
+            balanced = self._balance(node)
+            if balanced != node:
+                self._replace_child(path[i - 1] if i else NIL, node, balanced)
+            elif self._heights[node] == height:
+                break
+
+    def _height(self, node: int) -> int:
+        if node == NIL:
+            return 0
+        return self._heights[node]
+
+    def _update(self, node: int) -> None:
+        self._heights[node] = 1 + max(self._height(self._left[node]), self._height(self._right[node]))
+
+    def _get_balance(self, node: int) -> int:
+        if node == NIL:
+            return 0
+        return self._height(self._left[node]) - self._height(self._right[node])
+
+    def _balance(self, node: int) -> int:
+        balance_factor = self._get_balance(node)
+        if balance_factor > 1:
+            if self._get_balance(self._left[node]) < 0:
+                self._left[node] = self._rotate_left(self._left[node])
+            return self._rotate_right(node)
+        if balance_factor < -1:
+            if self._get_balance(self._right[node]) > 0:
+                self._right[node] = self._rotate_right(self._right[node])
+            return self._rotate_left(node)
+        return node
+
+    def _rotate_left(self, z: int) -> int:
+        y = self._right[z]
+        self._right[z] = self._left[y]
+        self._left[y] = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def _rotate_right(self, z: int) -> int:
+        y = self._left[z]
+        self._left[z] = self._right[y]
+        self._right[y] = z
+        self._update(z)
+        self._update(y)
+        return y
+
+    def inorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        keys: List[K] = []
+        stack: List[int] = []
+        node = self._root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = self._left[node]
+            node = stack.pop()
+            if visit:
+                visit(self._values[node])
+            keys.append(self._keys[node])
+            node = self._right[node]
+        return keys
+
+    def preorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        keys: List[K] = []
+        stack = [self._root] if self._root != NIL else []
+        while stack:
+            node = stack.pop()
+            if visit:
+                visit(self._values[node])
+            keys.append(self._keys[node])
+            if self._right[node] != NIL:
+                stack.append(self._right[node])
+            if self._left[node] != NIL:
+                stack.append(self._left[node])
+        return keys
+
+    def postorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        # Reverse of a node-right-left preorder, so visits are replayed backwards.
+        order: List[int] = []
+        stack = [self._root] if self._root != NIL else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if self._left[node] != NIL:
+                stack.append(self._left[node])
+            if self._right[node] != NIL:
+                stack.append(self._right[node])
+        order.reverse()
+        if visit:
+            for node in order:
+                visit(self._values[node])
+        return [self._keys[node] for node in order]
+
+    def bforder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        if self._root == NIL:
+            return []
+        keys: List[K] = []
+        queue = deque([self._root])
+        while queue:
+            node = queue.popleft()
+            if visit:
+                visit(self._values[node])
+            keys.append(self._keys[node])
+            if self._left[node] != NIL:
+                queue.append(self._left[node])
+            if self._right[node] != NIL:
+                queue.append(self._right[node])
+        return keys
+
+    def size(self) -> int:
+        return self._count
@@ -1,128 +1,405 @@
 from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Generic, List, Optional, Sequence, Tuple
+from enum import Enum, auto
+from heapq import merge
+from math import ceil, log2
+from operator import itemgetter, le
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple
 from datastructures.iavltree import IAVLTree, K, V
+from datastructures.mappedavltree import MappedAVLTree, infer_typecode, read_sorted, write_sorted
+
+class DuplicatePolicy(Enum):
+    ALLOW = auto()       # equal keys become separate nodes, placed to the right
+    REPLACE = auto()     # inserting an existing key overwrites its value
+    REJECT = auto()      # inserting an existing key raises KeyError
+    MULTISET = auto()    # equal keys share one node holding every value
 
 class AVLNode(Generic[K, V]):
-    def __init__(self, key: K, value: V, left: Optional[AVLNode] = None, right: Optional[AVLNode] = None):
-        self._key = key
-        self._value = value
-        self._left = left
-        self._right = right
-        self._height = 1
-
-    @property
-    def key(self) -> K:
-        return self._key
-
-    @key.setter
-    def key(self, new_key: K) -> None:
-        self._key = new_key
-
-    @property
-    def value(self) -> V:
-        return self._value
-
-    @value.setter
-    def value(self, new_value: V) -> None:
-        self._value = new_value
-
-    @property
-    def left(self) -> Optional[AVLNode]:
-        return self._left
-
-    @left.setter
-    def left(self, new_left: Optional[AVLNode]) -> None:
-        self._left = new_left
-
-    @property
-    def right(self) -> Optional[AVLNode]:
-        return self._right
-
-    @right.setter
-    def right(self, new_right: Optional[AVLNode]) -> None:
-        self._right = new_right
-
-    @property
-    def height(self) -> int:
-        return self._height
-
-    @height.setter
-    def height(self, new_height: int) -> None:
-        self._height = new_height
+    # Plain slotted attributes: no per-node __dict__ and no property call on
+    # every key/left/right access in the descent loops.
+    # count is the number of entries stored for key: value plus any extra
+    # values in bucket, which is only allocated for multiset duplicates.
+    # epoch is the tree version that owns the node; older nodes may be shared
+    # with snapshots and are copied before being modified.
+    __slots__ = ("key", "value", "left", "right", "height", "size", "count", "bucket", "epoch")
+
+    def __init__(self, key: K, value: V, left: Optional[AVLNode] = None, right: Optional[AVLNode] = None, epoch: int = 0):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.height = 1
+        self.size = 1
+        self.count = 1
+        self.bucket: Optional[List[V]] = None
+        self.epoch = epoch
 @dataclass
 class AVLTree(IAVLTree[K, V], Generic[K, V]):
-    def __init__(self, starting_sequence: Optional[Sequence[Tuple[K, V]]] = None):
+    def __init__(self, starting_sequence: Optional[Sequence[Tuple[K, V]]] = None, duplicates: DuplicatePolicy = DuplicatePolicy.ALLOW):
         self._root = None
+        self._duplicates = duplicates
+        self._epoch = 0
         if starting_sequence:
-            for key, value in starting_sequence:
-                self.insert(key, value)
+            self._root = self._build(self._sorted_pairs(starting_sequence))
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[Tuple[K, V]], duplicates: DuplicatePolicy = DuplicatePolicy.ALLOW) -> AVLTree[K, V]:
+        tree = cls(duplicates=duplicates)
+        tree._root = tree._build(cls._sorted_pairs(pairs))
+        return tree
+
+    @staticmethod
+    def _sorted_pairs(pairs: Iterable[Tuple[K, V]]) -> List[Tuple[K, V]]:
+        pairs = list(pairs)
+        keys = [pair[0] for pair in pairs]
+        if not all(map(le, keys, keys[1:])):
+            # Stable sort on the key only, so equal keys keep their input order
+            # just like repeated inserts would, and values are never compared.
+            pairs.sort(key=itemgetter(0))
+        return pairs
+
+    def _build(self, pairs: List[Tuple[K, V]]) -> Optional[AVLNode[K, V]]:
+        buckets: Dict[int, List[V]] = {}
+        if self._duplicates is not DuplicatePolicy.ALLOW:
+            # Collapse runs of equal keys the same way repeated inserts would.
+            unique: List[Tuple[K, V]] = []
+            for key, value in pairs:
+                if unique and unique[-1][0] == key:
+                    if self._duplicates is DuplicatePolicy.REPLACE:
+                        unique[-1] = (key, value)
+                    elif self._duplicates is DuplicatePolicy.REJECT:
+                        raise KeyError(key)
+                    else:
+                        buckets.setdefault(len(unique) - 1, []).append(value)
+                else:
+                    unique.append((key, value))
+            pairs = unique
+        return self._build_range(pairs, buckets, 0, len(pairs))
+
+    def _build_range(self, pairs: List[Tuple[K, V]], buckets: Dict[int, List[V]], lo: int, hi: int) -> Optional[AVLNode[K, V]]:
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, value = pairs[mid]
+        node = AVLNode(key, value, self._build_range(pairs, buckets, lo, mid), self._build_range(pairs, buckets, mid + 1, hi), self._epoch)
+        if mid in buckets:
+            node.bucket = buckets[mid]
+            node.count += len(node.bucket)
+        self._update(node)
+        return node
 
     def insert(self, key: K, value: V) -> None:
-        def _insert(node: Optional[AVLNode], key: K, value: V) -> AVLNode:
-            if not node:
-                return AVLNode(key, value)
-            if key < node.key:
-                node.left = _insert(node.left, key, value)
-            else:
-                node.right = _insert(node.right, key, value)
-            node.height = 1 + max(self._height(node.left), self._height(node.right))
-            return self._balance(node)
-        self._root = _insert(self._root, key, value)
+        if not self._root:
+            self._root = AVLNode(key, value, epoch=self._epoch)
+            return
+        merge_equal = self._duplicates is not DuplicatePolicy.ALLOW
+        path: List[AVLNode[K, V]] = []
+        node = self._root
+        while node:
+            if merge_equal and key == node.key:
+                path.append(node)
+                self._insert_existing(path, value)
+                return
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        self._own_path(path)
+        for ancestor in path:
+            ancestor.size += 1
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = AVLNode(key, value, epoch=self._epoch)
+        else:
+            parent.right = AVLNode(key, value, epoch=self._epoch)
+        self._rebalance_path(path)
+
+    def _insert_existing(self, path: List[AVLNode[K, V]], value: V) -> None:
+        if self._duplicates is DuplicatePolicy.REJECT:
+            raise KeyError(path[-1].key)
+        self._own_path(path)
+        node = path.pop()
+        if self._duplicates is DuplicatePolicy.REPLACE:
+            node.value = value
+        else:
+            if node.bucket is None:
+                node.bucket = []
+            node.bucket.append(value)
+            node.count += 1
+            node.size += 1
+            for ancestor in path:
+                ancestor.size += 1
 
     def search(self, key: K) -> V | None:
-        def _search(node: AVLNode, key: K) -> V | None:
-            if not node:
-                return None
-            if key == node.key:
+        node = self._root
+        while node:
+            node_key = node.key
+            if key == node_key:
                 return node.value
-            if key < node.key:
-                return _search(node.left, key)
-            return _search(node.right, key)
-        return _search(self._root, key)
+            node = node.left if key < node_key else node.right
+        return None
 
     def delete(self, key: K) -> None:
-        def _delete(node: Optional[AVLNode[K, V]], key: K) -> Optional[AVLNode[K, V]]:
-            if not node:
-                return node
-            if key < node.key:
-                node.left = _delete(node.left, key)
-            elif key > node.key:
-                node.right = _delete(node.right, key)
+        # Removes the in-order first entry for key, so delete and delete_many
+        # agree on which of several equal keys goes.
+        path: List[AVLNode[K, V]] = []
+        found, depth = None, 0
+        node = self._root
+        while node:
+            if key == node.key:
+                found, depth = node, len(path)
+                if self._duplicates is not DuplicatePolicy.ALLOW:
+                    break
+                # Rotations can leave an earlier equal key in the left subtree.
+                path.append(node)
+                node = node.left
             else:
-                if not node.left:
-                    return node.right
-                elif not node.right:
-                    return node.left
-                temp = self._min_value_node(node.right)
-                node.key = temp.key
-                node.value = temp.value
-                node.right = _delete(node.right, temp.key)
-            node.height = 1 + max(self._height(node.left), self._height(node.right))
-            return self._balance(node)
-        self._root = _delete(self._root, key)
-
-    def _min_value_node(self, node: AVLNode) -> AVLNode:
-        current = node
-        while current.left is not None:
-            current = current.left
-        return current
+                path.append(node)
+                node = node.left if key < node.key else node.right
+        if not found:
+            return
+        del path[depth:]
+        node = found
+        # Copy every node this delete may modify (down to the in-order
+        # successor's parent) before touching any of them.
+        path.append(node)
+        if node.count == 1 and node.left and node.right:
+            target = node.right
+            while target.left:
+                path.append(target)
+                target = target.left
+        self._own_path(path)
+        node = path[depth]
+        del path[depth:]
+        if node.count > 1:
+            # Multiset: drop the oldest value and keep the node.
+            node.value = node.bucket.pop(0)
+            if not node.bucket:
+                node.bucket = None
+            node.count -= 1
+            node.size -= 1
+            for ancestor in path:
+                ancestor.size -= 1
+            return
+        if node.left and node.right:
+            # Pull the in-order successor's entries up into this node and unlink
+            # the successor instead, extending the path down to its parent.
+            # Everything down to this node loses the one deleted entry; the
+            # nodes below it lose all of the successor's entries.
+            for ancestor in path:
+                ancestor.size -= 1
+            node.size -= 1
+            path.append(node)
+            below = len(path)
+            target = node.right
+            while target.left:
+                path.append(target)
+                target = target.left
+            for ancestor in path[below:]:
+                ancestor.size -= target.count
+            node.key = target.key
+            node.value = target.value
+            node.count = target.count
+            # target itself is not copied and may be shared with snapshots,
+            # so its bucket must not be shared with this node.
+            node.bucket = list(target.bucket) if target.bucket else None
+            replacement = target.right
+        else:
+            for ancestor in path:
+                ancestor.size -= 1
+            target = node
+            replacement = node.left if node.left else node.right
+        self._replace_child(path[-1] if path else None, target, replacement)
+        self._rebalance_path(path)
+
+    def search_all(self, key: K) -> List[V]:
+        node = self._find(key)
+        if not node:
+            return []
+        return [node.value, *node.bucket] if node.bucket else [node.value]
+
+    def count(self, key: K) -> int:
+        node = self._find(key)
+        return node.count if node else 0
+
+    def _find(self, key: K) -> Optional[AVLNode[K, V]]:
+        node = self._root
+        while node:
+            node_key = node.key
+            if key == node_key:
+                return node
+            node = node.left if key < node_key else node.right
+        return None
+
+    def insert_many(self, pairs: Iterable[Tuple[K, V]]) -> None:
+        pairs = list(pairs)
+        if self._prefer_rebuild(len(pairs), self.size() + len(pairs)):
+            # Existing entries come first on equal keys, as repeated inserts
+            # would place the new ones to their right. Under REJECT, _build
+            # raises before the root is replaced, leaving the tree unchanged.
+            self._root = self._build(list(merge(self.items(), self._sorted_pairs(pairs), key=itemgetter(0))))
+            return
+        if self._duplicates is DuplicatePolicy.REJECT:
+            # Check the whole batch first so a rejected batch inserts nothing,
+            # raising for the smallest clashing key just as _build would.
+            keys = sorted(pair[0] for pair in pairs)
+            for i, key in enumerate(keys):
+                if (i and keys[i - 1] == key) or self._find(key):
+                    raise KeyError(key)
+        for key, value in pairs:
+            self.insert(key, value)
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        keys = list(keys)
+        if self._prefer_rebuild(len(keys), self.size()):
+            # Walk the entries and the sorted batch together, dropping the
+            # in-order first entries for each key as delete would.
+            keys.sort()
+            kept: List[Tuple[K, V]] = []
+            pending = 0
+            for key, value in self.items():
+                while pending < len(keys) and keys[pending] < key:
+                    pending += 1
+                if pending < len(keys) and keys[pending] == key:
+                    pending += 1
+                else:
+                    kept.append((key, value))
+            self._root = self._build(kept)
+            return
+        for key in keys:
+            self.delete(key)
+
+    def search_many(self, keys: Iterable[K]) -> List[V | None]:
+        keys = list(keys)
+        results: List[V | None] = [None] * len(keys)
+        if all(map(le, keys, keys[1:])):
+            order: Sequence[int] = range(len(keys))
+            sorted_keys = keys
+        else:
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            sorted_keys = [keys[i] for i in order]
+        # Descend once for the whole batch: each node splits the still-pending
+        # slice of sorted keys between its subtrees, so shared path prefixes
+        # are walked a single time instead of once per key.
+        stack = [(self._root, 0, len(sorted_keys))]
+        while stack:
+            node, lo, hi = stack.pop()
+            if not node or lo >= hi:
+                continue
+            if hi - lo == 1:
+                # Nothing left to share below here: finish with a plain descent.
+                key = sorted_keys[lo]
+                while node:
+                    node_key = node.key
+                    if key == node_key:
+                        results[order[lo]] = node.value
+                        break
+                    node = node.left if key < node_key else node.right
+                continue
+            start = bisect_left(sorted_keys, node.key, lo, hi)
+            end = bisect_right(sorted_keys, node.key, start, hi)
+            for i in range(start, end):
+                results[order[i]] = node.value
+            stack.append((node.left, lo, start))
+            stack.append((node.right, end, hi))
+        return results
+
+    def _prefer_rebuild(self, batch_size: int, tree_size: int) -> bool:
+        # A merge-and-rebuild touches all tree_size nodes once; per-key updates
+        # cost a descent and rebalance each. Rebuild once the descents cost more.
+        return batch_size > 0 and batch_size * log2(tree_size + 1) > 8 * tree_size
+
+    def dump(self, path: str) -> None:
+        keys, values = list(self), [value for _, value in self.items()]
+        write_sorted(path, array(infer_typecode(keys), keys), array(infer_typecode(values), values))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False, duplicates: DuplicatePolicy = DuplicatePolicy.ALLOW, verify: bool = True) -> AVLTree[K, V] | MappedAVLTree[K, V]:
+        # With mmap=True the returned tree is read-only and served from the
+        # file itself; otherwise the dump is read into a regular AVLTree.
+        if mmap:
+            return MappedAVLTree(path, verify)
+        keys, values = read_sorted(path, verify)
+        tree = cls(duplicates=duplicates)
+        tree._root = tree._build(list(zip(keys, values)))
+        return tree
+
+    def snapshot(self) -> AVLSnapshot[K, V]:
+        # O(1): the snapshot shares every node. Bumping the epoch makes this
+        # tree copy a node before its next write to it, so only the O(log n)
+        # nodes on each modified path are ever duplicated.
+        snapshot = AVLSnapshot(self._root, self._duplicates)
+        self._epoch += 1
+        return snapshot
+
+    def _own(self, node: AVLNode[K, V]) -> AVLNode[K, V]:
+        if node.epoch == self._epoch:
+            return node
+        copy = AVLNode(node.key, node.value, node.left, node.right, self._epoch)
+        copy.height = node.height
+        copy.size = node.size
+        copy.count = node.count
+        copy.bucket = list(node.bucket) if node.bucket else None
+        return copy
+
+    def _own_path(self, path: List[AVLNode[K, V]]) -> None:
+        # Replace shared nodes on a root-to-node path with private copies,
+        # top-down so every parent is already private when it is re-linked.
+        parent = None
+        for i, node in enumerate(path):
+            if node.epoch != self._epoch:
+                copy = self._own(node)
+                self._replace_child(parent, node, copy)
+                path[i] = node = copy
+            parent = node
+
+    def _replace_child(self, parent: Optional[AVLNode[K, V]], child: AVLNode[K, V], replacement: Optional[AVLNode[K, V]]) -> None:
+        if parent is None:
+            self._root = replacement
+        elif parent.left is child:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+
+    def _rebalance_path(self, path: List[AVLNode[K, V]]) -> None:
+        # Walk back up the descent path bottom-up, re-linking any rotated
+        # subtree root. Callers have already adjusted subtree sizes along the
+        # path, so once a node keeps its height without rotating nothing above
+        # it can change and the walk stops early.
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            height = node.height
+            self._update(node)
+            balanced = self._balance(node)
+            if balanced is not node:
+                self._replace_child(path[i - 1] if i else None, node, balanced)
+            elif node.height == height:
+                break
 
     def _height(self, node: Optional[AVLNode]) -> int:
         if not node:
             return 0
         return node.height
 
+    def _size(self, node: Optional[AVLNode]) -> int:
+        if not node:
+            return 0
+        return node.size
+
+    def _update(self, node: AVLNode[K, V]) -> None:
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+
     def _balance(self, node: AVLNode[K, V]) -> AVLNode[K, V]:
         balance_factor = self._get_balance(node)
         if balance_factor > 1:
             if self._get_balance(node.left) < 0:
-                node.left = self._rotate_left(node.left)
+                node.left = self._rotate_left(self._own(node.left))
             return self._rotate_right(node)
         if balance_factor < -1:
             if self._get_balance(node.right) > 0:
-                node.right = self._rotate_right(node.right)
+                node.right = self._rotate_right(self._own(node.right))
             return self._rotate_left(node)
         return node
 
@@ -133,21 +410,21 @@ class AVLTree(IAVLTree[K, V], Generic[K, V]):
         return balance
 
     def _rotate_left(self, z: AVLNode[K, V]) -> AVLNode[K, V]:
-        y = z.right
+        y = self._own(z.right)
         T2 = y.left
         y.left = z
         z.right = T2
-        z.height = 1 + max(self._height(z.left), self._height(z.right))
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        self._update(z)
+        self._update(y)
         return y
 
     def _rotate_right(self, z: AVLNode[K, V]) -> AVLNode[K, V]:
-        y = z.left
+        y = self._own(z.left)
         T3 = y.right
         y.right = z
         z.left = T3
-        z.height = 1 + max(self._height(z.left), self._height(z.right))
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        self._update(z)
+        self._update(y)
         return y
 
     def inorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
@@ -155,9 +432,7 @@ class AVLTree(IAVLTree[K, V], Generic[K, V]):
             if not node:
                 return
             _inorder(node.left)
-            if visit:
-                visit(node.value)
-            keys.append(node.key)
+            self._emit(node, keys, visit)
             _inorder(node.right)
         keys: List[K] = []
         _inorder(self._root)
@@ -167,9 +442,7 @@ class AVLTree(IAVLTree[K, V], Generic[K, V]):
         def _preorder(node: Optional[AVLNode[K, V]]) -> None:
             if not node:
                 return
-            if visit:
-                visit(node.value)
-            keys.append(node.key)
+            self._emit(node, keys, visit)
             _preorder(node.left)
             _preorder(node.right)
         keys: List[K] = []
@@ -182,9 +455,7 @@ class AVLTree(IAVLTree[K, V], Generic[K, V]):
                 return
             _postorder(node.left)
             _postorder(node.right)
-            if visit:
-                visit(node.value)
-            keys.append(node.key)
+            self._emit(node, keys, visit)
         keys: List[K] = []
         _postorder(self._root)
         return keys
@@ -196,18 +467,184 @@ class AVLTree(IAVLTree[K, V], Generic[K, V]):
         queue = deque([self._root])
         while queue:
             node = queue.popleft()
-            if visit:
-                visit(node.value)
-            keys.append(node.key)
+            self._emit(node, keys, visit)
             if node.left:
                 queue.append(node.left)
             if node.right:
                 queue.append(node.right)
         return keys
 
+    def _emit(self, node: AVLNode[K, V], keys: List[K], visit: Optional[Callable[[V], None]]) -> None:
+        # Traversals report one key (and one visit) per stored entry.
+        if visit:
+            visit(node.value)
+        keys.append(node.key)
+        if node.bucket:
+            for value in node.bucket:
+                if visit:
+                    visit(value)
+                keys.append(node.key)
+
+    def __iter__(self) -> Iterator[K]:
+        for key, _ in self.iter_range():
+            yield key
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        return self.iter_range()
+
+    def iter_range(self, lo: Optional[K] = None, hi: Optional[K] = None, reverse: bool = False) -> Iterator[Tuple[K, V]]:
+        # Explicit stack holding at most one root-to-leaf path, so the scan
+        # costs O(log n) to find its start plus O(1) amortized per item yielded.
+        stack: List[AVLNode[K, V]] = []
+        node = self._root
+        if not reverse:
+            while node:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            while stack:
+                node = stack.pop()
+                if hi is not None and node.key > hi:
+                    return
+                yield node.key, node.value
+                if node.bucket:
+                    for value in node.bucket:
+                        yield node.key, value
+                node = node.right
+                while node:
+                    stack.append(node)
+                    node = node.left
+        else:
+            while node:
+                if hi is not None and node.key > hi:
+                    node = node.left
+                else:
+                    stack.append(node)
+                    node = node.right
+            while stack:
+                node = stack.pop()
+                if lo is not None and node.key < lo:
+                    return
+                yield node.key, node.value
+                if node.bucket:
+                    for value in node.bucket:
+                        yield node.key, value
+                node = node.left
+                while node:
+                    stack.append(node)
+                    node = node.right
+
+    def floor(self, key: K) -> Optional[K]:
+        result = None
+        node = self._root
+        while node:
+            if node.key <= key:
+                result = node.key
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def ceiling(self, key: K) -> Optional[K]:
+        result = None
+        node = self._root
+        while node:
+            if node.key >= key:
+                result = node.key
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def successor(self, key: K) -> Optional[K]:
+        result = None
+        node = self._root
+        while node:
+            if node.key > key:
+                result = node.key
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def predecessor(self, key: K) -> Optional[K]:
+        result = None
+        node = self._root
+        while node:
+            if node.key < key:
+                result = node.key
+                node = node.right
+            else:
+                node = node.left
+        return result
+
     def size(self) -> int:
-        def _size(node: Optional[AVLNode[K, V]]) -> int:
-            if not node:
-                return 0
-            return 1 + _size(node.left) + _size(node.right)
-        return _size(self._root)
\ No newline at end of file
+        return self._size(self._root)
+
+    def select(self, index: int) -> K:
+        if index < 0:
+            index += self.size()
+        if not 0 <= index < self.size():
+            raise IndexError("select index out of range")
+        node = self._root
+        while node:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.count:
+                return node.key
+            else:
+                index -= left_size + node.count
+                node = node.right
+        raise IndexError("select index out of range")
+
+    def rank(self, key: K) -> int:
+        rank = 0
+        node = self._root
+        while node:
+            if node.key < key:
+                rank += self._size(node.left) + node.count
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def median(self) -> K:
+        if not self._root:
+            raise IndexError("median of an empty tree")
+        return self.select((self.size() - 1) // 2)
+
+    def percentile(self, percent: float) -> K:
+        if not 0 <= percent <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not self._root:
+            raise IndexError("percentile of an empty tree")
+        # Nearest-rank definition: the smallest key with at least percent% of keys <= it.
+        return self.select(max(ceil(percent / 100 * self.size()) - 1, 0))
+
+
+class AVLSnapshot(AVLTree[K, V]):
+    # Immutable view returned by AVLTree.snapshot(). It shares nodes with the
+    # live tree, which never modifies a node it has handed out, so readers
+    # can traverse it without locking while the tree keeps changing.
+    def __init__(self, root: Optional[AVLNode[K, V]], duplicates: DuplicatePolicy):
+        self._root = root
+        self._duplicates = duplicates
+        self._epoch = -1
+
+    def snapshot(self) -> AVLSnapshot[K, V]:
+        return self
+
+    def insert(self, key: K, value: V) -> None:
+        raise TypeError("AVLTree snapshots are read-only")
+
+    def delete(self, key: K) -> None:
+        raise TypeError("AVLTree snapshots are read-only")
+
+    def insert_many(self, pairs: Iterable[Tuple[K, V]]) -> None:
+        raise TypeError("AVLTree snapshots are read-only")
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        raise TypeError("AVLTree snapshots are read-only")
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Ticks/sec with range-alert subscriptions registered on StockManager.
+
+Registers the subscriptions in one subscribe_many call, then times ticks
+through _add_price_data, each stabbing its symbol's subscription tree.
+Run from the repository root:
+
+    python -m benchmarks.bench_alerts --subscriptions 1000000 --symbols 100
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional
+
+from program import StockManager
+
+
+def run(subscriptions: int, symbols: int, ticks: int, width: int, seed: int) -> None:
+    rng = random.Random(seed)
+    names = [f"SYM{i}" for i in range(symbols)]
+    watches = []
+    for _ in range(subscriptions):
+        low = rng.uniform(0, 1000)
+        watches.append((rng.choice(names), low, low + rng.uniform(0, width)))
+    manager = StockManager()
+    fired = 0
+
+    def count(alert) -> None:
+        nonlocal fired
+        fired += 1
+
+    started = time.perf_counter()
+    manager.subscribe_many(watches, count)
+    print(f"subscribed {subscriptions:,} watches over {symbols:,} symbols in {time.perf_counter() - started:.2f}s")
+    feed = [(rng.choice(names), rng.uniform(0, 1000)) for _ in range(ticks)]
+    started = time.perf_counter()
+    for timestamp, (symbol, price) in enumerate(feed):
+        manager._add_price_data(symbol, price, timestamp)
+    elapsed = time.perf_counter() - started
+    print(f"{ticks:,} ticks: {ticks / elapsed:,.0f} ticks/s, {fired / ticks:.1f} alerts per tick")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=100_000)
+    parser.add_argument("--width", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.subscriptions, args.symbols, args.ticks, args.width, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""Batched insert_many/delete_many/search_many vs. per-key loops on AVLTree.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch --n 1000000 --max-batch 1000000
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from datastructures.avltree import AVLTree
+
+
+def _seconds(tree: AVLTree, operation: Callable[[AVLTree], object]) -> float:
+    start = time.perf_counter()
+    operation(tree)
+    return time.perf_counter() - start
+
+
+def run(n: int, max_batch: int, seed: int) -> None:
+    rng = random.Random(seed)
+    base: List[Tuple[int, int]] = sorted((key, key) for key in rng.sample(range(4 * n), n))
+    print(f"base tree: {n:,} keys")
+    print(f"{'batch':>10}{'op':>8}{'loop ops/s':>16}{'batch ops/s':>16}{'speedup':>10}")
+    batch_size = 10
+    while batch_size <= max_batch:
+        fresh = [(key, key) for key in rng.sample(range(4 * n, 8 * n), batch_size)]
+        existing = [key for key, _ in rng.sample(base, min(batch_size, n))]
+        cases = (
+            ("insert", len(fresh),
+             lambda tree: [tree.insert(key, value) for key, value in fresh],
+             lambda tree: tree.insert_many(fresh)),
+            ("delete", len(existing),
+             lambda tree: [tree.delete(key) for key in existing],
+             lambda tree: tree.delete_many(existing)),
+            ("search", len(existing),
+             lambda tree: [tree.search(key) for key in existing],
+             lambda tree: tree.search_many(existing)),
+        )
+        for name, count, loop, batch in cases:
+            # Every timed call gets a freshly built tree so mutations don't leak.
+            looped = _seconds(AVLTree.from_sorted(base), loop)
+            batched = _seconds(AVLTree.from_sorted(base), batch)
+            print(f"{batch_size:>10,}{name:>8}{count / looped:>16,.0f}{count / batched:>16,.0f}{looped / batched:>9.2f}x")
+        batch_size *= 10
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="keys in the tree each batch is applied to")
+    parser.add_argument("--max-batch", type=int, default=1_000_000, help="largest batch size (sizes go 10, 100, ...)")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.n, args.max_batch, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
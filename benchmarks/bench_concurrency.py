@@ -0,0 +1,102 @@
+"""Reads/sec from reader threads while one writer thread updates stocks at a fixed rate.
+
+Compares ConcurrentStockManager with a StockManager behind a single lock.
+Run from the repository root:
+
+    python -m benchmarks.bench_concurrency --stocks 50000 --readers 4 --seconds 2
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import Callable, List, Optional
+
+from program import ConcurrentStockManager, Stock, StockManager
+
+
+class LockedStockManager(StockManager):
+    # Baseline: every call serialized on one lock.
+    def __init__(self):
+        self._lock = threading.Lock()
+        super().__init__()
+
+    def range_query(self, low: int, high: int) -> List[Stock]:
+        with self._lock:
+            return super().range_query(low, high)
+
+    def update_stock(self, symbol: str, new_low: int, new_high: int):
+        with self._lock:
+            super().update_stock(symbol, new_low, new_high)
+
+
+def _measure(manager, symbols: List[str], readers: int, write_rate: int, seconds: float, seed: int) -> float:
+    done = threading.Event()
+    reads = [0] * readers
+
+    def read(slot: int) -> None:
+        rng = random.Random(seed + slot)
+        while not done.is_set():
+            low = rng.randrange(10_000)
+            manager.range_query(low, low + 20)
+            reads[slot] += 1
+
+    def write() -> None:
+        rng = random.Random(seed)
+        interval = 1 / write_rate
+        next_write = time.perf_counter()
+        while not done.is_set():
+            low = rng.randrange(10_000)
+            manager.update_stock(rng.choice(symbols), low, low + rng.randrange(1, 50))
+            next_write += interval
+            delay = next_write - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    threads = [threading.Thread(target=read, args=(slot,)) for slot in range(readers)]
+    if write_rate:
+        threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    done.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds
+
+
+def run(stocks: int, readers: int, seconds: float, seed: int) -> None:
+    rng = random.Random(seed)
+    universe = []
+    for i in range(stocks):
+        low = rng.randrange(10_000)
+        universe.append((f"SYM{i}", low, low + rng.randrange(1, 50)))
+    symbols = [symbol for symbol, _, _ in universe]
+    managers: List[Callable[[], object]] = [
+        LockedStockManager,
+        lambda: ConcurrentStockManager(price_bands=range(500, 10_000, 500)),
+    ]
+    print(f"{stocks:,} stocks, {readers} reader threads, {seconds}s per point")
+    print(f"{'writes/s':>10}{'locked reads/s':>18}{'sharded reads/s':>18}")
+    for write_rate in (0, 100, 1_000, 10_000):
+        rates = []
+        for make in managers:
+            manager = make()
+            manager.add_stocks(Stock(symbol, symbol, low, high) for symbol, low, high in universe)
+            rates.append(_measure(manager, symbols, readers, write_rate, seconds, seed))
+        print(f"{write_rate:>10,}{rates[0]:>18,.0f}{rates[1]:>18,.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stocks", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.stocks, args.readers, args.seconds, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
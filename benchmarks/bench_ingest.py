@@ -0,0 +1,59 @@
+"""Ticks/sec and ingest-to-visible latency of TickIngestor feeding a StockManager.
+
+Replays pre-generated ticks from memory, so the numbers cover batching,
+queueing and applying but not parsing. Run from the repository root:
+
+    python -m benchmarks.bench_ingest --ticks 500000 --symbols 1000
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import AsyncIterator, List, Optional
+
+from datastructures.ingest import Tick, TickIngestor
+from program import Stock, StockManager
+
+
+async def _feed(ticks: List[Tick]) -> AsyncIterator[Tick]:
+    for tick in ticks:
+        yield tick
+
+
+def run(ticks: int, symbols: int, range_every: int, seed: int) -> None:
+    rng = random.Random(seed)
+    names = [f"SYM{i}" for i in range(symbols)]
+    feed = []
+    for i in range(ticks):
+        price = rng.uniform(10, 1000)
+        if range_every and not i % range_every:
+            feed.append(Tick(rng.choice(names), price, i, 1.0, price - 5, price + 5))
+        else:
+            feed.append(Tick(rng.choice(names), price, i))
+    print(f"{ticks:,} ticks over {symbols:,} symbols, a new range every {range_every} ticks")
+    print(f"{'batch':>8}{'ticks/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'max queued':>12}")
+    for batch_size in (256, 1024, 4096, 16384):
+        manager = StockManager()
+        manager.add_stocks(Stock(name, name, 100, 110) for name in names)
+        ingestor = TickIngestor(manager, batch_size=batch_size)
+        started = time.perf_counter()
+        stats = asyncio.run(ingestor.run(_feed(feed)))
+        elapsed = time.perf_counter() - started
+        print(f"{batch_size:>8,}{stats.ticks / elapsed:>12,.0f}"
+              f"{stats.latency(50) / 1e6:>10.2f}{stats.latency(99) / 1e6:>10.2f}{stats.max_queued:>12}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500_000)
+    parser.add_argument("--symbols", type=int, default=1_000)
+    parser.add_argument("--range-every", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.ticks, args.symbols, args.range_every, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""IntervalTree.from_intervals vs. one insert per interval.
+
+The bulk load is also timed with the garbage collector paused, as a caller
+loading millions of intervals at once may choose to do: every node
+allocated otherwise triggers collections that walk the nodes built so far.
+Run from the repository root:
+
+    python -m benchmarks.bench_interval_bulkload --n 1000000
+"""
+from __future__ import annotations
+import argparse
+import gc
+import random
+import sys
+import time
+from typing import Any, List, Optional, Tuple
+
+from datastructures.intervaltree import IntervalTree
+
+
+def _insert_all(intervals: List[Tuple[int, int, Any]]) -> IntervalTree:
+    tree = IntervalTree()
+    for low, high, value in intervals:
+        tree.insert(low, high, value)
+    return tree
+
+
+def run(n: int, max_width: int, seed: int) -> None:
+    rng = random.Random(seed)
+    intervals: List[Tuple[int, int, Any]] = []
+    for i in range(n):
+        low = rng.randrange(100 * n)
+        intervals.append((low, low + rng.randrange(max_width), i))
+    start = time.perf_counter()
+    IntervalTree.from_intervals(intervals)
+    bulk = time.perf_counter() - start
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        IntervalTree.from_intervals(intervals)
+        paused = time.perf_counter() - start
+    finally:
+        gc.enable()
+    start = time.perf_counter()
+    _insert_all(intervals)
+    looped = time.perf_counter() - start
+    print(f"{'intervals':>12}{'insert s':>12}{'bulk s':>12}{'speedup':>10}{'bulk, gc paused s':>20}")
+    print(f"{n:>12,}{looped:>12.3f}{bulk:>12.3f}{looped / bulk:>9.2f}x{paused:>20.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="intervals to load")
+    parser.add_argument("--max-width", type=int, default=1_000, help="widths are drawn from [0, max-width)")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.n, args.max_width, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
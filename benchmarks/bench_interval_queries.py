@@ -0,0 +1,57 @@
+"""Nodes visited per IntervalTree query against log2(n) + k.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_interval_queries --n 1000000
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from math import log2
+from typing import Callable, Iterator, List, Optional
+
+from datastructures.intervaltree import IntervalTree
+
+
+def run(n: int, queries: int, max_width: int, seed: int) -> None:
+    rng = random.Random(seed)
+    domain = n * 10
+    tree = IntervalTree()
+    for i in range(n):
+        low = rng.randrange(domain)
+        tree.insert(low, low + rng.randrange(max_width), i)
+    print(f"n={n:,}  log2(n)={log2(n):.1f}")
+    print(f"{'query':<14}{'avg k':>10}{'avg visited':>14}{'visited/(log2 n + k)':>24}{'queries/s':>12}")
+    cases: List[tuple[str, Callable[[int], Iterator[object]]]] = [
+        ("stab", lambda point: tree.stab(point)),
+        ("overlaps", lambda point: tree.overlaps(point, point + max_width)),
+        ("contained_in", lambda point: tree.contained_in(point, point + 4 * max_width)),
+        ("contains", lambda point: tree.contains(point, point + max_width // 4)),
+    ]
+    for name, query in cases:
+        points = [rng.randrange(domain) for _ in range(queries)]
+        tree.nodes_visited = 0
+        found = 0
+        start = time.perf_counter()
+        for point in points:
+            found += sum(1 for _ in query(point))
+        seconds = time.perf_counter() - start
+        k = found / queries
+        visited = tree.nodes_visited / queries
+        print(f"{name:<14}{k:>10.1f}{visited:>14.1f}{visited / (log2(n) + k):>24.2f}{queries / seconds:>12,.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="number of intervals in the tree")
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--max-width", type=int, default=100, help="intervals are [low, low + randrange(max_width)]")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.n, args.queries, args.max_width, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+"""Recursive vs. iterative insert/search throughput for AVLTree.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_iterative --n 1000000
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import Callable, List, Optional
+
+from datastructures.avltree import AVLNode, AVLTree
+
+
+class RecursiveAVLTree(AVLTree):
+    # The closure-based insert/search that AVLTree used before the path-stack
+    # rewrite, kept here only as the baseline to measure against.
+    def insert(self, key, value) -> None:
+        def _insert(node: Optional[AVLNode], key, value) -> AVLNode:
+            if not node:
+                return AVLNode(key, value)
+            if key < node.key:
+                node.left = _insert(node.left, key, value)
+            else:
+                node.right = _insert(node.right, key, value)
+            self._update(node)
+            return self._balance(node)
+        self._root = _insert(self._root, key, value)
+
+    def search(self, key):
+        def _search(node: AVLNode, key):
+            if not node:
+                return None
+            if key == node.key:
+                return node.value
+            if key < node.key:
+                return _search(node.left, key)
+            return _search(node.right, key)
+        return _search(self._root, key)
+
+
+def _time(operation: Callable[[int], object], keys: List[int]) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return time.perf_counter() - start
+
+
+def run(n: int, seed: int) -> None:
+    rng = random.Random(seed)
+    keys = rng.sample(range(n * 10), n)
+    lookups = [rng.choice(keys) for _ in range(n)]
+    print(f"{'engine':<12}{'insert ops/s':>16}{'search ops/s':>16}")
+    for name, tree in (("recursive", RecursiveAVLTree()), ("iterative", AVLTree())):
+        insert_seconds = _time(lambda key: tree.insert(key, key), keys)
+        search_seconds = _time(tree.search, lookups)
+        print(f"{name:<12}{n / insert_seconds:>16,.0f}{n / search_seconds:>16,.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="number of random keys to insert and look up")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.n, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,94 @@
+"""Bytes per node for the slotted AVLNode/IntervalNode layouts vs. the old ones,
+and bytes per key for AVLTree vs. the array-backed ArrayAVLTree.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_node_memory --n 1000000
+"""
+from __future__ import annotations
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional, Tuple
+
+from datastructures.arrayavltree import ArrayAVLTree
+from datastructures.avltree import AVLNode, AVLTree
+from datastructures.intervaltree import IntervalNode
+
+
+class PropertyAVLNode:
+    # The previous AVLNode layout: a per-instance __dict__ behind properties.
+    def __init__(self, key, value, left=None, right=None):
+        self._key = key
+        self._value = value
+        self._left = left
+        self._right = right
+        self._height = 1
+        self._size = 1
+
+
+@dataclass
+class EagerIntervalNode:
+    # The previous IntervalNode layout: every node allocated its own AVLTree.
+    key: Tuple[int, int]
+    value: Any
+    left: Optional['EagerIntervalNode'] = None
+    right: Optional['EagerIntervalNode'] = None
+    height: int = 1
+    max_end: int = 0
+    intervals_at_low: AVLTree = field(default_factory=AVLTree)
+
+
+def bytes_per_node(make_node: Callable[[int], object], n: int) -> float:
+    # Keys/values are shared small objects created up front so only the
+    # node objects themselves (and what they allocate) are measured.
+    keys = list(range(n))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes: List[object] = [make_node(key) for key in keys]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Discount the list holding the nodes.
+    return (after - before - sys.getsizeof(nodes)) / n
+
+
+def bytes_per_key(build: Callable[[List[Tuple[int, float]]], object], n: int) -> float:
+    # Measures what the tree keeps alive once the input pairs are dropped:
+    # AVLTree retains the key/value objects, ArrayAVLTree only raw copies.
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pairs = [(key, float(key)) for key in range(n)]
+    tree = build(pairs)
+    del pairs
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return (after - before) / n
+
+
+def run(n: int) -> None:
+    rows = (
+        ("AVLNode", lambda key: PropertyAVLNode(key, key), lambda key: AVLNode(key, key)),
+        ("IntervalNode", lambda key: EagerIntervalNode((key, key), key, max_end=key), lambda key: IntervalNode((key, key), key, max_end=key)),
+    )
+    print(f"{'node':<14}{'before B/node':>16}{'after B/node':>16}{'saved':>10}")
+    for name, before, after in rows:
+        old = bytes_per_node(before, n)
+        new = bytes_per_node(after, n)
+        print(f"{name:<14}{old:>16,.1f}{new:>16,.1f}{1 - new / old:>10.0%}")
+    node_tree = bytes_per_key(AVLTree.from_sorted, n)
+    array_tree = bytes_per_key(lambda pairs: ArrayAVLTree(pairs, typecode="q", value_typecode="d"), n)
+    print(f"{'tree':<14}{'AVLTree B/key':>16}{'Array B/key':>16}{'ratio':>10}")
+    print(f"{'int->float':<14}{node_tree:>16,.1f}{array_tree:>16,.1f}{node_tree / array_tree:>9.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="number of nodes to allocate per layout")
+    args = parser.parse_args(argv)
+    run(args.n)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
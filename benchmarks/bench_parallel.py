@@ -0,0 +1,62 @@
+"""Batched range queries on ParallelStockManager's process pool vs. one StockManager.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parallel --stocks 200000 --queries 20000 --partitions 8
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional
+
+from program import ParallelStockManager, Stock, StockManager
+
+
+def run(stocks: int, queries: int, partitions: int, workers: Optional[int], seed: int) -> None:
+    rng = random.Random(seed)
+    universe = []
+    for i in range(stocks):
+        low = rng.randrange(100_000)
+        universe.append(Stock(f"SYM{i}", f"Company {i}", low, low + rng.randrange(1, 200)))
+    windows = []
+    for _ in range(queries):
+        low = rng.randrange(100_000)
+        windows.append((low, low + rng.randrange(50)))
+    boundaries = [100_000 * i // partitions for i in range(1, partitions)]
+
+    single = StockManager()
+    single.add_stocks(universe)
+    start = time.perf_counter()
+    for low, high in windows:
+        single.range_query(low, high)
+    looped = time.perf_counter() - start
+
+    with ParallelStockManager(boundaries, max_workers=workers) as parallel:
+        parallel.add_stocks(universe)
+        start = time.perf_counter()
+        parallel.range_query_batch(windows)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        parallel.range_query_batch(windows)
+        warm = time.perf_counter() - start
+    print(f"{stocks:,} stocks, {queries:,} windows, {partitions} partitions")
+    print(f"{'':>22}{'seconds':>10}{'queries/s':>14}")
+    for name, seconds in (("single process", looped), ("pool, first batch", first), ("pool, warm batch", warm)):
+        print(f"{name:>22}{seconds:>10.3f}{queries / seconds:>14,.0f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stocks", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="pool size (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.stocks, args.queries, args.partitions, args.workers, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+"""StockManager delete/update through the symbol index vs. the old full-tree scan.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stock_lookup --n 50000 --ops 1000
+"""
+from __future__ import annotations
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional
+
+from program import Stock, StockManager
+
+
+class ScanningStockManager(StockManager):
+    # The previous lookup: list every stock and compare symbols one by one.
+    def _find_stock(self, symbol: str) -> Optional[Stock]:
+        for stock in self._interval_tree.range_query(float('-inf'), float('inf')):
+            if stock.symbol == symbol:
+                return stock
+        return None
+
+
+def _build(cls: type, stocks: List[Stock]) -> StockManager:
+    manager = cls()
+    manager.add_stocks(Stock(stock.symbol, stock.name, stock.low, stock.high) for stock in stocks)
+    return manager
+
+
+def run(n: int, ops: int, seed: int) -> None:
+    rng = random.Random(seed)
+    stocks = []
+    for i in range(n):
+        low = rng.randrange(10_000)
+        stocks.append(Stock(f"SYM{i}", f"Company {i}", low, low + rng.randrange(1, 500)))
+    symbols = [stock.symbol for stock in rng.sample(stocks, ops)]
+    print(f"{n:,} stocks, {ops:,} operations")
+    print(f"{'op':>8}{'scan ops/s':>14}{'index ops/s':>14}{'speedup':>10}")
+    for name in ("update", "delete"):
+        rates = []
+        for cls in (ScanningStockManager, StockManager):
+            manager = _build(cls, stocks)
+            start = time.perf_counter()
+            for symbol in symbols:
+                if name == "update":
+                    manager.update_stock(symbol, 20_000, 20_100)
+                else:
+                    manager.delete_stock(symbol)
+            rates.append(ops / (time.perf_counter() - start))
+        print(f"{name:>8}{rates[0]:>14,.0f}{rates[1]:>14,.0f}{rates[1] / rates[0]:>9.1f}x")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=50_000, help="stocks tracked")
+    parser.add_argument("--ops", type=int, default=1_000, help="updates and deletes timed")
+    parser.add_argument("--seed", type=int, default=351)
+    args = parser.parse_args(argv)
+    run(args.n, args.ops, args.seed)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,236 @@
+"""Reproducible benchmark suite for AVLTree, IntervalTree and StockManager.
+
+Every (suite, key distribution, size) case runs in a fresh process, so its
+peak RSS is its own. Per operation it records ops/sec over all calls and
+latency percentiles over up to --samples individually timed calls. Results
+are written as JSON; pass an earlier file to --compare to flag regressions.
+Run from the repository root:
+
+    python -m benchmarks.suite --sizes 1e3 1e4 1e5 --output after.json --compare before.json
+"""
+from __future__ import annotations
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from datastructures.avltree import AVLTree
+from datastructures.intervaltree import IntervalTree
+from program import Stock, StockManager
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "clustered", "duplicates")
+SUITES = ("avltree", "intervaltree", "stockmanager")
+
+
+@dataclass
+class Result:
+    suite: str
+    op: str
+    distribution: str
+    size: int
+    ops: int
+    seconds: float
+    ops_per_sec: float
+    p50_ns: int
+    p90_ns: int
+    p99_ns: int
+    max_ns: int
+    peak_rss_kb: Optional[int]  # of the whole case, not just this operation
+
+
+def generate_keys(distribution: str, n: int, seed: int) -> List[int]:
+    rng = random.Random(seed)
+    if distribution == "random":
+        return rng.sample(range(4 * n), n)
+    if distribution == "sorted":
+        return sorted(rng.sample(range(4 * n), n))
+    if distribution == "reversed":
+        return sorted(rng.sample(range(4 * n), n), reverse=True)
+    if distribution == "clustered":
+        # A few dense clumps, one per thousand keys, spread over a wide domain.
+        centers = [rng.randrange(100 * n) for _ in range(max(1, n // 1000))]
+        return [rng.choice(centers) + int(rng.gauss(0, 50)) for _ in range(n)]
+    if distribution == "duplicates":
+        # About a hundred copies of each key.
+        return [rng.randrange(max(1, n // 100)) for _ in range(n)]
+    raise ValueError(f"unknown distribution {distribution!r}")
+
+
+def _percentile(ordered: Sequence[int], percent: float) -> int:
+    return ordered[max(0, -(-len(ordered) * percent // 100) - 1)] if ordered else 0
+
+
+def _time_ops(operation: Callable[[Any], object], arguments: Sequence[Any], samples: int) -> Tuple[int, float, List[int]]:
+    # Every call counts towards throughput; only every stride-th call is
+    # timed on its own, so latency arrays stay small at 1e7 operations.
+    stride = max(1, len(arguments) // samples)
+    latencies = array("q")
+    clock = time.perf_counter_ns
+    started = clock()
+    for index, argument in enumerate(arguments):
+        if index % stride:
+            operation(argument)
+        else:
+            before = clock()
+            operation(argument)
+            latencies.append(clock() - before)
+    return len(arguments), (clock() - started) / 1e9, sorted(latencies)
+
+
+def _repeat(operation: Callable[[], object], times: int, samples: int) -> Tuple[int, float, List[int]]:
+    return _time_ops(lambda _: operation(), range(times), samples)
+
+
+def _avltree_ops(keys: List[int], rng: random.Random, ops: int, samples: int) -> Iterable[Tuple[str, Tuple]]:
+    tree: AVLTree[int, int] = AVLTree()
+    yield "insert", _time_ops(lambda key: tree.insert(key, key), keys, samples)
+    yield "search", _time_ops(tree.search, rng.choices(keys, k=ops), samples)
+    for traversal in ("inorder", "preorder", "postorder", "bforder"):
+        yield traversal, _repeat(getattr(tree, traversal), 3, samples)
+    yield "delete", _time_ops(tree.delete, rng.sample(keys, min(ops, len(keys))), samples)
+
+
+def _intervaltree_ops(keys: List[int], rng: random.Random, ops: int, samples: int) -> Iterable[Tuple[str, Tuple]]:
+    intervals = [(key, key + rng.randrange(1, 100), index) for index, key in enumerate(keys)]
+    tree = IntervalTree()
+    yield "insert", _time_ops(lambda interval: tree.insert(*interval), intervals, samples)
+    yield "range_query", _time_ops(lambda window: tree.range_query(*window), _windows(keys, rng, ops), samples)
+    yield "top_k_stocks", _repeat(lambda: tree.top_k_stocks(10), ops, samples)
+    yield "delete", _time_ops(lambda interval: tree.delete(*interval), rng.sample(intervals, min(ops, len(intervals))), samples)
+
+
+def _stockmanager_ops(keys: List[int], rng: random.Random, ops: int, samples: int) -> Iterable[Tuple[str, Tuple]]:
+    stocks = [Stock(f"S{index}", f"STOCK {index}", key, key + rng.randrange(1, 100)) for index, key in enumerate(keys)]
+    manager = StockManager()
+    yield "add_stock", _time_ops(manager.add_stock, stocks, samples)
+    symbols = [stock.symbol for stock in rng.choices(stocks, k=ops)]
+    yield "_find_stock", _time_ops(manager._find_stock, symbols, samples)
+    yield "range_query", _time_ops(lambda window: manager.range_query(*window), _windows(keys, rng, ops), samples)
+    yield "top_k_stocks", _repeat(lambda: manager.top_k_stocks(10), ops, samples)
+    yield "delete_stock", _time_ops(manager.delete_stock, [stock.symbol for stock in rng.sample(stocks, min(ops, len(stocks)))], samples)
+
+
+def _windows(keys: List[int], rng: random.Random, count: int) -> List[Tuple[int, int]]:
+    low, high = min(keys), max(keys)
+    return [(start, start + 50) for start in (rng.randint(low, high) for _ in range(count))]
+
+
+CASES: Dict[str, Callable[..., Iterable[Tuple[str, Tuple]]]] = {
+    "avltree": _avltree_ops,
+    "intervaltree": _intervaltree_ops,
+    "stockmanager": _stockmanager_ops,
+}
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def run_case(suite: str, distribution: str, size: int, ops: int, samples: int, seed: int) -> List[Result]:
+    keys = generate_keys(distribution, size, seed)
+    rng = random.Random(seed + 1)
+    measured = []
+    for op, (count, seconds, latencies) in CASES[suite](keys, rng, ops, samples):
+        measured.append((op, count, seconds, latencies))
+    peak = _peak_rss_kb()
+    return [Result(suite, op, distribution, size, count, seconds, count / seconds if seconds else float('inf'),
+                   _percentile(latencies, 50), _percentile(latencies, 90), _percentile(latencies, 99),
+                   latencies[-1] if latencies else 0, peak)
+            for op, count, seconds, latencies in measured]
+
+
+def run(suites: Sequence[str], distributions: Sequence[str], sizes: Sequence[int], ops: int, samples: int,
+        seed: int) -> List[Result]:
+    results: List[Result] = []
+    # One spawned process per case: peak RSS is a high-water mark that
+    # never drops, and a forked child would start from the parent's.
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        for suite in suites:
+            for distribution in distributions:
+                for size in sizes:
+                    case = pool.submit(run_case, suite, distribution, size, ops, samples, seed).result()
+                    for result in case:
+                        print(f"{suite:>13}{result.op:>14}{distribution:>12}{size:>12,}{result.ops_per_sec:>14,.0f}"
+                              f"{result.p50_ns / 1e3:>10.1f}{result.p99_ns / 1e3:>10.1f}{result.peak_rss_kb or 0:>12,}")
+                    results.extend(case)
+    return results
+
+
+def _metadata(seed: int, ops: int, samples: int) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "seed": seed, "ops": ops, "samples": samples}
+
+
+def compare(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]], threshold: float) -> List[str]:
+    # Regressions of current against baseline: throughput down or p99
+    # latency up by more than threshold (a fraction), per matching case.
+    key = lambda result: (result["suite"], result["op"], result["distribution"], result["size"])
+    before = {key(result): result for result in baseline}
+    regressions = []
+    for result in current:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        name = "/".join(map(str, key(result)))
+        if result["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: {old['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f} ops/s "
+                               f"({result['ops_per_sec'] / old['ops_per_sec'] - 1:+.0%})")
+        if old["p99_ns"] and result["p99_ns"] > old["p99_ns"] * (1 + threshold):
+            regressions.append(f"{name}: p99 {old['p99_ns'] / 1e3:,.1f} -> {result['p99_ns'] / 1e3:,.1f} us "
+                               f"({result['p99_ns'] / old['p99_ns'] - 1:+.0%})")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument("--sizes", nargs="+", type=lambda size: int(float(size)), default=[1_000, 10_000, 100_000],
+                        help="e.g. 1e3 1e4 1e5 1e6 1e7; the larger sizes take minutes per case")
+    parser.add_argument("--ops", type=int, default=10_000, help="calls per search/query/delete operation")
+    parser.add_argument("--samples", type=int, default=100_000, help="most calls timed individually per operation")
+    parser.add_argument("--seed", type=int, default=351)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to check against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, as a fraction")
+    args = parser.parse_args(argv)
+
+    print(f"{'suite':>13}{'op':>14}{'keys':>12}{'size':>12}{'ops/s':>14}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>12}")
+    results = [asdict(result) for result in run(args.suites, args.distributions, args.sizes, args.ops, args.samples, args.seed)]
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"meta": _metadata(args.seed, args.ops, args.samples), "results": results}, file, indent=1)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.compare}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
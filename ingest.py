@@ -0,0 +1,137 @@
+from __future__ import annotations
+import asyncio
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Protocol, Tuple
+
+
+class Tick(NamedTuple):
+    symbol: str
+    price: float
+    timestamp: Optional[int] = None  # ns; None means stamp on arrival at the manager
+    volume: float = 1.0
+    # A new trading range for the symbol, applied with update_stock.
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+
+class TickSink(Protocol):
+    # Applies a batch of ticks in one pass and returns how many were dropped.
+    def apply_ticks(self, ticks: List[Tick]) -> int: ...
+
+
+@dataclass
+class IngestStats:
+    ticks: int = 0
+    batches: int = 0
+    dropped: int = 0  # rejected by the sink, e.g. older than the symbol's last tick
+    max_queued: int = 0  # deepest the queue of full batches got
+    # Per batch, ns from the arrival of its first tick until the sink had
+    # applied it: the worst ingest-to-visible latency of any tick in it.
+    latencies: array = field(default_factory=lambda: array("q"))
+
+    def latency(self, percentile: float) -> Optional[int]:
+        # Nearest-rank percentile of the batch latencies, in ns.
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(rank) - 1]
+
+
+class TickIngestor:
+    # Feeds an async stream of ticks into a sink such as StockManager. Ticks
+    # are cut into batches of at most batch_size; a batch is also closed once
+    # its first tick has waited max_delay seconds, which bounds latency when
+    # the feed is slow. Full batches wait in a queue of at most max_pending,
+    # so a sink that falls behind stops the reader instead of growing memory.
+    # Everything runs on the event loop thread, so the sink needs no locking.
+    def __init__(self, sink: TickSink, batch_size: int = 1024, max_delay: float = 0.002,
+                 max_pending: int = 16, clock: Callable[[], int] = time.perf_counter_ns):
+        if batch_size <= 0 or max_pending <= 0:
+            raise ValueError("batch_size and max_pending must be positive")
+        self._sink = sink
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._clock = clock
+        self.stats = IngestStats()
+        self._open: List[Tick] = []  # batch being filled
+        self._opened = 0  # arrival time of the open batch's first tick
+
+    async def run(self, source: AsyncIterator[Tick]) -> IngestStats:
+        queue: asyncio.Queue[Optional[Tuple[int, List[Tick]]]] = asyncio.Queue(self._max_pending)
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._apply(queue))
+            group.create_task(self._read(source, queue))
+        return self.stats
+
+    async def _read(self, source: AsyncIterator[Tick], queue: asyncio.Queue):
+        batch_size, clock = self._batch_size, self._clock
+        async for tick in source:
+            if not self._open:
+                self._opened = clock()
+            self._open.append(tick)
+            if len(self._open) >= batch_size:
+                await queue.put(self._take())
+                self.stats.max_queued = max(self.stats.max_queued, queue.qsize())
+                # put does not suspend while there is room, so give the
+                # applier a turn or a source that never blocks would starve it.
+                await asyncio.sleep(0)
+        if self._open:
+            await queue.put(self._take())
+        await queue.put(None)
+
+    async def _apply(self, queue: asyncio.Queue):
+        while True:
+            if queue.empty():
+                try:
+                    item = await asyncio.wait_for(queue.get(), self._max_delay)
+                except TimeoutError:
+                    # The feed is slow: apply whatever has gathered so far.
+                    if not self._open:
+                        continue
+                    item = self._take()
+            else:
+                item = queue.get_nowait()
+            if item is None:
+                return
+            opened, ticks = item
+            self.stats.dropped += self._sink.apply_ticks(ticks)
+            self.stats.latencies.append(self._clock() - opened)
+            self.stats.ticks += len(ticks)
+            self.stats.batches += 1
+
+    def _take(self) -> Tuple[int, List[Tick]]:
+        ticks, self._open = self._open, []
+        return self._opened, ticks
+
+
+def parse_tick(line: str) -> Tick:
+    # symbol,price[,timestamp[,volume[,low,high]]]; empty fields take defaults.
+    fields = line.strip().split(",")
+    symbol, price = fields[0], float(fields[1])
+    timestamp = int(fields[2]) if len(fields) > 2 and fields[2] else None
+    volume = float(fields[3]) if len(fields) > 3 and fields[3] else 1.0
+    low = float(fields[4]) if len(fields) > 5 and fields[4] else None
+    high = float(fields[5]) if len(fields) > 5 and fields[5] else None
+    return Tick(symbol, price, timestamp, volume, low, high)
+
+
+async def read_ticks(reader: asyncio.StreamReader) -> AsyncIterator[Tick]:
+    # One tick per line, e.g. from asyncio.open_connection to a local feed.
+    async for line in reader:
+        if line.strip():
+            yield parse_tick(line.decode())
+
+
+async def replay(path: str, lines_per_yield: int = 4096) -> AsyncIterator[Tick]:
+    # Ticks from a file as fast as they parse, handing the loop back every
+    # lines_per_yield lines so other tasks keep running during a long replay.
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            if line.strip():
+                yield parse_tick(line)
+            if not number % lines_per_yield:
+                await asyncio.sleep(0)
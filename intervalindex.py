@@ -0,0 +1,51 @@
+from __future__ import annotations
+from array import array
+from heapq import heappop, heappush
+from typing import Any, Iterable, List, Tuple
+from datastructures.mappedavltree import infer_typecode
+
+
+class StaticIntervalIndex:
+    # Read-only snapshot of an IntervalTree's intervals, held as parallel
+    # arrays sorted by low, for answering large batches of stabbing queries
+    # in a single sweep instead of one tree walk per point.
+    def __init__(self, intervals: Iterable[Tuple[int, int, Any]]):
+        intervals = sorted(intervals, key=lambda interval: interval[0])
+        lows = [low for low, _, _ in intervals]
+        highs = [high for _, high, _ in intervals]
+        self.lows = array(infer_typecode(lows) if lows else "q", lows)
+        self.highs = array(infer_typecode(highs) if highs else "q", highs)
+        self.values: List[Any] = [value for _, _, value in intervals]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def stab_many(self, points: Iterable[int]) -> Tuple[array, array]:
+        # Returns CSR-style (offsets, indices): the intervals containing
+        # points[j] are indices[offsets[j]:offsets[j + 1]], as positions in
+        # lows/highs/values in ascending low order.
+        #
+        # Points are swept in increasing order. Intervals enter a min-heap on
+        # high once their low is reached and leave once their high falls
+        # behind the sweep, so the heap holds exactly the matches for the
+        # current point: O((n + m) log n + k) for n intervals, m points and
+        # k results overall.
+        points = list(points)
+        lows, highs = self.lows, self.highs
+        matches: List[List[int]] = [[] for _ in points]
+        active: List[Tuple[int, int]] = []
+        next_interval = 0
+        for j in sorted(range(len(points)), key=points.__getitem__):
+            point = points[j]
+            while next_interval < len(lows) and lows[next_interval] <= point:
+                heappush(active, (highs[next_interval], next_interval))
+                next_interval += 1
+            while active and active[0][0] < point:
+                heappop(active)
+            matches[j] = sorted(index for _, index in active)
+        offsets = array("q", [0])
+        indices = array("q")
+        for found in matches:
+            indices.extend(found)
+            offsets.append(len(indices))
+        return offsets, indices
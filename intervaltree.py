@@ -1,83 +1,16 @@
 from __future__ import annotations
-from collections import deque
-from dataclasses import dataclass, field
-from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, Union
-
-from datastructures.iavltree import IAVLTree, K, V
-
-
-@dataclass
-class AVLNode(Generic[K, V]):
-    def __init__(self, key: K, value: V, left: Optional[AVLNode]=None, right: Optional[AVLNode]=None):
-        self._key = key
-        self._value = value
-        self._left = left
-        self._right = right
-        self._height = 1
-
-    @property
-    def key(self) -> K:
-        return self._key
-
-    @key.setter
-    def key(self, new_key: K) -> None:
-        self._key = new_key
-
-    @property
-    def height(self) -> int:
-        return self._height
-
-    @height.setter
-    def height(self, new_height: int) -> None:
-        self._height = new_height
-
-
-class AVLTree(IAVLTree[K, V], Generic[K, V]):
-    def __init__(self, starting_sequence: Optional[Sequence[Tuple[K, V]]]=None):
-        self._root = None
-        if starting_sequence:
-            for key, value in starting_sequence:
-                self.insert(key, value)
-
-    def insert(self, key: K, value: V) -> None:
-        raise NotImplementedError
-
-    def search(self, key: K) -> Union[V, None]:
-        raise NotImplementedError
-
-    def rotate_right(self, y: AVLNode[K, V]) -> AVLNode[K, V]:
-        x = y.left
-        T2 = x.right
-        x.right = y
-        y.left = T2
-        self.update_height(y)
-        self.update_height(x)
-        return x
-
-    def rotate_left(self, x: AVLNode[K, V]) -> AVLNode[K, V]:
-        y = x.right
-        T2 = y.left
-        y.left = x
-        x.right = T2
-        self.update_height(x)
-        self.update_height(y)
-        return y
-
-    def update_height(self, node: AVLNode[K, V]) -> None:
-        node.height = 1 + max(self.get_height(node.left), self.get_height(node.right))
+from dataclasses import dataclass
+from heapq import heappop, heappush, nlargest, nsmallest
+from itertools import count, islice
+from math import log2
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-    def get_height(self, node: Optional[AVLNode[K, V]]) -> int:
-        if not node:
-            return 0
-        return node.height
-
-    def get_balance(self, node: AVLNode[K, V]) -> int:
-        if not node:
-            return 0
-        return self.get_height(node.left) - self.get_height(node.right)
+from datastructures.avltree import AVLTree
+from datastructures.intervalindex import StaticIntervalIndex
 
 
-@dataclass
+@dataclass(slots=True)
 class IntervalNode:
     key: Tuple[int, int]
     value: Any
@@ -85,133 +18,416 @@ class IntervalNode:
     right: Optional['IntervalNode'] = None
     height: int = 1
     max_end: int = 0
-    intervals_at_low: AVLTree = field(default_factory=AVLTree)
+    min_low: int = 0
+    max_width: int = 0
+    # Further intervals sharing this low endpoint, as high -> list of values.
+    # Created on demand, only once a second interval shares the low.
+    intervals_at_low: Optional[AVLTree] = None
 
 
-class IntervalTree:
-    def __init__(self):
-        self.root: Optional[IntervalNode] = None
+# Built-in ranking metrics for top_k/bottom_k, called as metric(low, high, value).
+METRICS: Dict[str, Callable[[int, int, Any], Any]] = {
+    "low": lambda low, high, value: low,
+    "high": lambda low, high, value: high,
+    "width": lambda low, high, value: high - low,
+    "midpoint": lambda low, high, value: (low + high) / 2,
+}
 
-    def insert(self, low: int, high: int, value: Any):
-        self.root = self._insert(self.root, low, high, value)
+# Subtree maxima that bound each metric, letting top_k prune by best-first search.
+METRIC_BOUNDS: Dict[str, Callable[[IntervalNode], Any]] = {
+    "high": lambda node: node.max_end,
+    "width": lambda node: node.max_width,
+}
 
-    def _insert(self, node: Optional[IntervalNode], low: int, high: int, value: Any) -> IntervalNode:
-        if not node:
-            return IntervalNode(key=(low, high), value=value, max_end=high)
 
-        if low < node.key[0]:
-            node.left = self._insert(node.left, low, high, value)
-        else:
-            node.right = self._insert(node.right, low, high, value)
-
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
-        node.max_end = max(node.max_end, high)
-
-        balance = self._get_balance(node)
+class IntervalTree:
+    def __init__(self):
+        self.root: Optional[IntervalNode] = None
+        # Running count of nodes examined by queries, for checking pruning.
+        self.nodes_visited = 0
+        self._size = 0
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Tuple[int, int, Any]]) -> IntervalTree:
+        tree = cls()
+        tree._build(intervals)
+        return tree
+
+    def _build(self, intervals: Iterable[Tuple[int, int, Any]]):
+        # Stable sort, so intervals sharing a low keep their input order just
+        # like repeated inserts would.
+        intervals = sorted(intervals, key=itemgetter(0))
+        nodes: List[IntervalNode] = []
+        node = None
+        for low, high, value in intervals:
+            if node and node.key[0] == low:
+                self._add_at_low(node, high, value)
+                node.max_end = max(node.max_end, high)
+                node.max_width = max(node.max_width, high - low)
+            else:
+                node = IntervalNode((low, high), value, None, None, 1, high, low, high - low)
+                nodes.append(node)
+        self.root = self._link_range(nodes, 0, len(nodes)) if nodes else None
+        self._size = len(intervals)
+
+    def _link_range(self, nodes: List[IntervalNode], lo: int, hi: int) -> IntervalNode:
+        # Nodes are in low order, so the subtree over [lo, hi) is rooted at
+        # its middle node and its height follows from its size alone.
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        if lo < mid:
+            left = node.left = self._link_range(nodes, lo, mid)
+            node.min_low = left.min_low
+            if left.max_end > node.max_end:
+                node.max_end = left.max_end
+            if left.max_width > node.max_width:
+                node.max_width = left.max_width
+        if mid + 1 < hi:
+            right = node.right = self._link_range(nodes, mid + 1, hi)
+            if right.max_end > node.max_end:
+                node.max_end = right.max_end
+            if right.max_width > node.max_width:
+                node.max_width = right.max_width
+        node.height = (hi - lo).bit_length()
+        return node
 
-        if balance > 1 and low < node.left.key[0]:
-            return self._right_rotate(node)
-        if balance < -1 and low > node.right.key[0]:
-            return self._left_rotate(node)
-        if balance > 1 and low > node.left.key[0]:
-            node.left = self._left_rotate(node.left)
-            return self._right_rotate(node)
-        if balance < -1 and low < node.right.key[0]:
-            node.right = self._right_rotate(node.right)
-            return self._left_rotate(node)
+    def extend(self, intervals: Iterable[Tuple[int, int, Any]]):
+        intervals = list(intervals)
+        if self._prefer_rebuild(len(intervals), self._size + len(intervals)):
+            self._build([*self.intervals(), *intervals])
+            return
+        for low, high, value in intervals:
+            self.insert(low, high, value)
 
-        return node
+    def _prefer_rebuild(self, batch_size: int, tree_size: int) -> bool:
+        # Same trade-off as AVLTree: rebuild once the per-interval descents
+        # would cost more than touching every node once.
+        return batch_size > 0 and batch_size * log2(tree_size + 1) > 8 * tree_size
 
-    def delete(self, low: int, high: int):
-        self.root = self._delete(self.root, low, high)
+    def size(self) -> int:
+        return self._size
 
-    def _delete(self, node: Optional[IntervalNode], low: int, high: int) -> Optional[IntervalNode]:
+    def insert(self, low: int, high: int, value: Any):
+        self._size += 1
+        new_node = IntervalNode(key=(low, high), value=value, max_end=high, min_low=low, max_width=high - low)
+        if not self.root:
+            self.root = new_node
+            return
+        path: List[IntervalNode] = []
+        node = self.root
+        while node:
+            path.append(node)
+            if low == node.key[0]:
+                self._add_at_low(node, high, value)
+                self._rebalance_path(path)
+                return
+            node = node.left if low < node.key[0] else node.right
+        parent = path[-1]
+        if low < parent.key[0]:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+
+    def delete(self, low: int, high: int, value: Any = None):
+        # Removes one interval [low, high], the one holding value if given.
+        path: List[IntervalNode] = []
+        node = self.root
+        while node and low != node.key[0]:
+            path.append(node)
+            node = node.left if low < node.key[0] else node.right
         if not node:
-            return node
-
-        if low < node.key[0]:
-            node.left = self._delete(node.left, low, high)
-        elif low > node.key[0]:
-            node.right = self._delete(node.right, low, high)
+            return
+        if node.key[1] == high and (value is None or node.value == value):
+            self._size -= 1
+            if node.intervals_at_low is None:
+                self._remove_node(path, node)
+                return
+            # Promote another interval at this low into the node.
+            promoted_high, values = next(node.intervals_at_low.items())
+            node.key, node.value = (low, promoted_high), values[0]
+            self._take_at_low(node, promoted_high, None)
+        elif self._take_at_low(node, high, value):
+            self._size -= 1
         else:
-            if not node.left:
-                return node.right
-            elif not node.right:
-                return node.left
-
-            temp = self._min_value_node(node.right)
-            node.key = temp.key
-            node.value = temp.value
-            node.right = self._delete(node.right, temp.key[0], temp.key[1])
-
-        node.height = 1 + max(self._get_height(node.left), self._get_height(node.right))
-        node.max_end = max(node.key[1], self._get_max_end(node.left), self._get_max_end(node.right))
-
-        balance = self._get_balance(node)
-
-        if balance > 1 and self._get_balance(node.left) >= 0:
-            return self._right_rotate(node)
-        if balance > 1 and self._get_balance(node.left) < 0:
-            node.left = self._left_rotate(node.left)
-            return self._right_rotate(node)
-        if balance < -1 and self._get_balance(node.right) <= 0:
-            return self._left_rotate(node)
-        if balance < -1 and self._get_balance(node.right) > 0:
-            node.right = self._right_rotate(node.right)
-            return self._left_rotate(node)
-
-        return node
+            return
+        path.append(node)
+        self._rebalance_path(path)
+
+    def _add_at_low(self, node: IntervalNode, high: int, value: Any):
+        if node.intervals_at_low is None:
+            node.intervals_at_low = AVLTree()
+        values = node.intervals_at_low.search(high)
+        if values is None:
+            node.intervals_at_low.insert(high, [value])
+        else:
+            values.append(value)
+
+    def _take_at_low(self, node: IntervalNode, high: int, value: Any) -> bool:
+        extras = node.intervals_at_low
+        values = extras.search(high) if extras is not None else None
+        if not values:
+            return False
+        if value is None:
+            values.pop(0)
+        elif value in values:
+            values.remove(value)
+        else:
+            return False
+        if not values:
+            extras.delete(high)
+            if not extras.size():
+                node.intervals_at_low = None
+        return True
+
+    def _remove_node(self, path: List[IntervalNode], node: IntervalNode):
+        stop_from = len(path)
+        if node.left and node.right:
+            path.append(node)
+            target = node.right
+            while target.left:
+                path.append(target)
+                target = target.left
+            node.key = target.key
+            node.value = target.value
+            node.intervals_at_low = target.intervals_at_low
+            replacement = target.right
+        else:
+            target = node
+            replacement = node.left if node.left else node.right
+        self._replace_child(path[-1] if path else None, target, replacement)
+        self._rebalance_path(path, stop_from)
 
     def update(self, low: int, high: int, new_low: int, new_high: int, value: Any):
-        self.delete(low, high)
-        self.insert(new_low, new_high, value)
+        # Replaces one interval [low, high] with [new_low, new_high] holding
+        # value: the one already holding value if there is one, otherwise the
+        # first stored, so callers may also change the value. With the low
+        # endpoint unchanged the node keeps its place in the tree, so only the
+        # high is edited and max_end/max_width refreshed up the path. A
+        # changed low needs the interval relocated.
+        path: List[IntervalNode] = []
+        node = self.root
+        while node and low != node.key[0]:
+            path.append(node)
+            node = node.left if low < node.key[0] else node.right
+        if not node or not self._holds(node, high, None):
+            self.insert(new_low, new_high, value)
+            return
+        # None picks the first interval [low, high], as in delete.
+        old = value if self._holds(node, high, value) else None
+        if new_low != low:
+            self.delete(low, high, old)
+            self.insert(new_low, new_high, value)
+            return
+        if node.key[1] == high and (old is None or node.value == old):
+            node.key, node.value = (low, new_high), value
+        else:
+            self._take_at_low(node, high, old)
+            self._add_at_low(node, new_high, value)
+        path.append(node)
+        self._rebalance_path(path)
+
+    def _holds(self, node: IntervalNode, high: int, value: Any) -> bool:
+        # Whether node stores an interval [node's low, high], holding value
+        # unless value is None.
+        if node.key[1] == high and (value is None or node.value == value):
+            return True
+        values = node.intervals_at_low.search(high) if node.intervals_at_low is not None else None
+        return bool(values) and (value is None or value in values)
 
     def range_query(self, low: int, high: int) -> List[Any]:
-        result = []
-        self._range_query(self.root, low, high, result)
+        return list(self.overlaps(low, high))
+
+    def intervals(self) -> Iterator[Tuple[int, int, Any]]:
+        stack: List[IntervalNode] = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            for high, value in self._at_low(node):
+                yield node.key[0], high, value
+            node = node.right
+
+    def freeze(self) -> StaticIntervalIndex:
+        return StaticIntervalIndex(self.intervals())
+
+    def stab(self, point: int) -> Iterator[Any]:
+        return self._values(self._query(high_min=point, low_max=point))
+
+    def overlaps(self, low: int, high: int) -> Iterator[Any]:
+        return self._values(self._query(high_min=low, low_max=high))
+
+    def contained_in(self, low: int, high: int) -> Iterator[Any]:
+        return self._values(self._query(low_min=low, low_max=high, high_max=high))
+
+    def contains(self, low: int, high: int) -> Iterator[Any]:
+        return self._values(self._query(high_min=high, low_max=low))
+
+    def _values(self, intervals: Iterator[Tuple[int, int, Any]]) -> Iterator[Any]:
+        for _, _, value in intervals:
+            yield value
+
+    def _query(self, low_min: float = float('-inf'), low_max: float = float('inf'),
+               high_min: float = float('-inf'), high_max: float = float('inf'),
+               reverse: bool = False) -> Iterator[Tuple[int, int, Any]]:
+        # Yields, in low order (descending if reverse), the intervals with low
+        # in [low_min, low_max] and high in [high_min, high_max]. A subtree is
+        # skipped when its max_end is below high_min or its min_low is above
+        # low_max; BST order also cuts left subtrees below low_min and right
+        # subtrees above low_max.
+        stack: List[IntervalNode] = []
+        node = self.root
+        while True:
+            while node:
+                self.nodes_visited += 1
+                if node.max_end < high_min or node.min_low > low_max:
+                    break
+                stack.append(node)
+                if reverse:
+                    node = node.right if node.key[0] <= low_max else None
+                else:
+                    node = node.left if node.key[0] >= low_min else None
+            if not stack:
+                return
+            node = stack.pop()
+            low, high = node.key
+            if low_min <= low <= low_max:
+                if high_min <= high <= high_max:
+                    yield low, high, node.value
+                if node.intervals_at_low is not None:
+                    for high, values in node.intervals_at_low.iter_range(high_min, high_max):
+                        for value in values:
+                            yield low, high, value
+            if reverse:
+                node = node.left if low >= low_min else None
+            else:
+                node = node.right if low <= low_max else None
+
+    def top_k(self, k: int, key: Union[str, Callable[[int, int, Any], Any]] = "low",
+              overlapping: Optional[Tuple[int, int]] = None) -> List[Any]:
+        # Values of the k intervals ranking highest by key, optionally only
+        # among those overlapping the (low, high) range given as overlapping.
+        if k <= 0:
+            return []
+        low_min, low_max = overlapping if overlapping else (float('-inf'), float('inf'))
+        if key == "low":
+            return list(islice(self._values(self._query(high_min=low_min, low_max=low_max, reverse=True)), k))
+        if key in METRIC_BOUNDS:
+            return self._top_k_pruned(k, METRICS[key], METRIC_BOUNDS[key], low_min, low_max)
+        metric = METRICS[key] if isinstance(key, str) else key
+        candidates = self._query(high_min=low_min, low_max=low_max)
+        return [value for _, _, value in nlargest(k, candidates, key=lambda interval: metric(*interval))]
+
+    def bottom_k(self, k: int, key: Union[str, Callable[[int, int, Any], Any]] = "low",
+                 overlapping: Optional[Tuple[int, int]] = None) -> List[Any]:
+        # Like top_k, lowest first. Only "low" follows tree order; other
+        # metrics have no subtree minima to prune with and use a bounded heap.
+        if k <= 0:
+            return []
+        low_min, low_max = overlapping if overlapping else (float('-inf'), float('inf'))
+        candidates = self._query(high_min=low_min, low_max=low_max)
+        if key == "low":
+            return list(islice(self._values(candidates), k))
+        metric = METRICS[key] if isinstance(key, str) else key
+        return [value for _, _, value in nsmallest(k, candidates, key=lambda interval: metric(*interval))]
+
+    def _top_k_pruned(self, k: int, metric: Callable[[int, int, Any], Any], bound: Callable[[IntervalNode], Any],
+                      low_min: float, low_max: float) -> List[Any]:
+        # Best-first search: the heap holds subtrees keyed by their bound and
+        # single intervals keyed by their exact metric, so an interval popped
+        # from it outranks everything not yet expanded. Ties go to whichever
+        # entry was pushed first.
+        result: List[Any] = []
+        order = count()
+        heap: List[Tuple[Any, int, Optional[IntervalNode], Any]] = []
+        if self.root:
+            heappush(heap, (-bound(self.root), next(order), self.root, None))
+        while heap and len(result) < k:
+            _, _, node, value = heappop(heap)
+            if node is None:
+                result.append(value)
+                continue
+            self.nodes_visited += 1
+            if node.max_end < low_min or node.min_low > low_max:
+                continue
+            low = node.key[0]
+            if low <= low_max:
+                for high, value in self._at_low(node):
+                    if high >= low_min:
+                        heappush(heap, (-metric(low, high, value), next(order), None, value))
+            for child in (node.left, node.right):
+                if child:
+                    heappush(heap, (-bound(child), next(order), child, None))
         return result
 
-    def _range_query(self, node: Optional[IntervalNode], low: int, high: int, result: List[Any]):
-        if not node:
-            return
-        if node.key[0] <= high and node.key[1] >= low:
-            result.append(node.value)
-        if node.left and node.left.max_end >= low:
-            self._range_query(node.left, low, high, result)
-        if node.right and node.key[0] <= high:
-            self._range_query(node.right, low, high, result)
-
     def top_k_stocks(self, k: int) -> List[Any]:
-        result = []
-        self._top_k_stocks(self.root, k, result)
-        return result
-
-    def _top_k_stocks(self, node: Optional[IntervalNode], k: int, result: List[Any]):
-        if not node or len(result) >= k:
-            return
-        self._top_k_stocks(node.right, k, result)
-        if len(result) < k:
-            result.append(node.value)
-            self._top_k_stocks(node.left, k, result)
+        return self.top_k(k)
 
     def bottom_k_stocks(self, k: int) -> List[Any]:
-        result = []
-        self._bottom_k_stocks(self.root, k, result)
-        return result
-
-    def _bottom_k_stocks(self, node: Optional[IntervalNode], k: int, result: List[Any]):
-        if not node or len(result) >= k:
-            return
-        self._bottom_k_stocks(node.left, k, result)
-        if len(result) < k:
-            result.append(node.value)
-            self._bottom_k_stocks(node.right, k, result)
-
-    def _min_value_node(self, node: IntervalNode) -> IntervalNode:
-        current = node
-        while current.left:
-            current = current.left
-        return current
+        return self.bottom_k(k)
+
+    def _at_low(self, node: IntervalNode) -> Iterator[Tuple[int, Any]]:
+        # (high, value) for every interval stored at node's low endpoint.
+        yield node.key[1], node.value
+        if node.intervals_at_low is not None:
+            for high, values in node.intervals_at_low.items():
+                for value in values:
+                    yield high, value
+
+    def _replace_child(self, parent: Optional[IntervalNode], child: IntervalNode, replacement: Optional[IntervalNode]):
+        if parent is None:
+            self.root = replacement
+        elif parent.left is child:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+
+    def _rebalance_path(self, path: List[IntervalNode], stop_from: Optional[int] = None):
+        # Stop as soon as a node keeps its height and augmentations without
+        # rotating: nothing above it can change after that. Nodes below stop_from must
+        # all be revisited because the node at stop_from had its key replaced.
+        if stop_from is None:
+            stop_from = len(path)
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            before = (node.height, node.max_end, node.min_low, node.max_width)
+            self._update(node)
+            balanced = self._balance(node)
+            if balanced is not node:
+                self._replace_child(path[i - 1] if i else None, node, balanced)
+            elif (node.height, node.max_end, node.min_low, node.max_width) == before and i <= stop_from:
+                break
+
+    def _update(self, node: IntervalNode):
+        left, right = node.left, node.right
+        node.height = 1 + max(self._get_height(left), self._get_height(right))
+        node.max_end = node.key[1]
+        if node.intervals_at_low is not None:
+            node.max_end = max(node.max_end, node.intervals_at_low.select(-1))
+        node.min_low = node.key[0]
+        node.max_width = node.max_end - node.min_low
+        if left:
+            node.max_end = max(node.max_end, left.max_end)
+            node.min_low = min(node.min_low, left.min_low)
+            node.max_width = max(node.max_width, left.max_width)
+        if right:
+            node.max_end = max(node.max_end, right.max_end)
+            node.min_low = min(node.min_low, right.min_low)
+            node.max_width = max(node.max_width, right.max_width)
+
+    def _balance(self, node: IntervalNode) -> IntervalNode:
+        balance = self._get_balance(node)
+        if balance > 1:
+            if self._get_balance(node.left) < 0:
+                node.left = self._left_rotate(node.left)
+            return self._right_rotate(node)
+        if balance < -1:
+            if self._get_balance(node.right) > 0:
+                node.right = self._right_rotate(node.right)
+            return self._left_rotate(node)
+        return node
 
     def _get_height(self, node: Optional[IntervalNode]) -> int:
         if not node:
@@ -223,20 +439,13 @@ class IntervalTree:
             return 0
         return self._get_height(node.left) - self._get_height(node.right)
 
-    def _get_max_end(self, node: Optional[IntervalNode]) -> int:
-        if not node:
-            return 0
-        return node.max_end
-
     def _right_rotate(self, z: IntervalNode) -> IntervalNode:
         y = z.left
         T3 = y.right
         y.right = z
         z.left = T3
-        z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
-        y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
-        z.max_end = max(z.key[1], self._get_max_end(z.left), self._get_max_end(z.right))
-        y.max_end = max(y.key[1], self._get_max_end(y.left), self._get_max_end(y.right))
+        self._update(z)
+        self._update(y)
         return y
 
     def _left_rotate(self, z: IntervalNode) -> IntervalNode:
@@ -244,8 +453,6 @@ class IntervalTree:
         T2 = y.left
         y.left = z
         z.right = T2
-        z.height = 1 + max(self._get_height(z.left), self._get_height(z.right))
-        y.height = 1 + max(self._get_height(y.left), self._get_height(y.right))
-        z.max_end = max(z.key[1], self._get_max_end(z.left), self._get_max_end(z.right))
-        y.max_end = max(y.key[1], self._get_max_end(y.left), self._get_max_end(y.right))
+        self._update(z)
+        self._update(y)
         return y
\ No newline at end of file
@@ -0,0 +1,215 @@
+from __future__ import annotations
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Callable, Generic, Iterator, List, Optional, Sequence, Tuple
+from datastructures.iavltree import IAVLTree, K, V
+
+# File layout, little-endian: a fixed header followed by the sorted keys array
+# and then the values array, each count * 8 bytes. The CRC covers both arrays.
+MAGIC = b"AVLTREE\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHccQI")
+TYPECODES = ("q", "d")
+
+def infer_typecode(items: Sequence[object]) -> str:
+    if all(type(item) is int for item in items):
+        return "q"
+    if all(type(item) in (int, float) for item in items):
+        return "d"
+    raise TypeError("only int and float keys/values can be dumped")
+
+def write_sorted(path: str, keys: array, values: array) -> None:
+    if keys.typecode not in TYPECODES or values.typecode not in TYPECODES:
+        raise TypeError(f"unsupported typecodes {keys.typecode!r}/{values.typecode!r}")
+    if len(keys) != len(values):
+        raise ValueError("keys and values must have the same length")
+    if sys.byteorder != "little":
+        keys, values = array(keys.typecode, keys), array(values.typecode, values)
+        keys.byteswap()
+        values.byteswap()
+    checksum = zlib.crc32(values, zlib.crc32(keys))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, keys.typecode.encode(), values.typecode.encode(), len(keys), checksum))
+        keys.tofile(file)
+        values.tofile(file)
+
+def _parse(buffer: memoryview, verify: bool) -> Tuple[memoryview, memoryview]:
+    # Only the returned views outlive this call: every temporary slice is
+    # released here, so a caller can close a memory map after a failure.
+    if len(buffer) < HEADER.size:
+        raise ValueError("file is too short to be an AVLTree dump")
+    magic, version, key_typecode, value_typecode, count, checksum = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("not an AVLTree dump")
+    if version != VERSION:
+        raise ValueError(f"unsupported AVLTree dump version {version}")
+    key_typecode, value_typecode = key_typecode.decode(), value_typecode.decode()
+    if key_typecode not in TYPECODES or value_typecode not in TYPECODES:
+        raise ValueError("corrupt AVLTree dump header")
+    if len(buffer) - HEADER.size != count * 16:
+        raise ValueError("AVLTree dump is truncated or has trailing data")
+    middle = HEADER.size + count * 8
+    if verify:
+        with buffer[HEADER.size:] as payload:
+            if zlib.crc32(payload) != checksum:
+                raise ValueError("AVLTree dump checksum mismatch")
+    with buffer[HEADER.size:middle] as keys, buffer[middle:] as values:
+        return keys.cast(key_typecode), values.cast(value_typecode)
+
+def read_sorted(path: str, verify: bool = True) -> Tuple[array, array]:
+    with open(path, "rb") as file:
+        data = file.read()
+    keys, values = _parse(memoryview(data), verify)
+    keys, values = array(keys.format, keys), array(values.format, values)
+    if sys.byteorder != "little":
+        keys.byteswap()
+        values.byteswap()
+    return keys, values
+
+
+class MappedAVLTree(IAVLTree[K, V], Generic[K, V]):
+    # Read-only tree answered straight from a memory-mapped dump. The sorted
+    # arrays are an implicit perfectly balanced AVL tree (the middle slot of a
+    # range is its root), the same shape AVLTree.from_sorted would build, so
+    # nothing is materialized up front and lookups are binary searches.
+    def __init__(self, path: str, verify: bool = True):
+        if sys.byteorder != "little":
+            raise OSError("memory-mapped AVLTree dumps require a little-endian host")
+        file = open(path, "rb")
+        mapped = view = None
+        try:
+            # mmap refuses empty files; report them like any other short dump.
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError("file is too short to be an AVLTree dump")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            self._keys, self._values = _parse(view, verify)
+        except BaseException:
+            if view is not None:
+                view.release()
+            if mapped is not None:
+                mapped.close()
+            file.close()
+            raise
+        view.release()
+        self._file = file
+        self._mmap = mapped
+
+    def close(self) -> None:
+        # Views into the map must be released before it can be closed.
+        for view in ("_keys", "_values"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+                delattr(self, view)
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> MappedAVLTree[K, V]:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def insert(self, key: K, value: V) -> None:
+        raise TypeError("memory-mapped AVLTree is read-only")
+
+    def delete(self, key: K) -> None:
+        raise TypeError("memory-mapped AVLTree is read-only")
+
+    def search(self, key: K) -> V | None:
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._values[index]
+        return None
+
+    def size(self) -> int:
+        return len(self._keys)
+
+    def select(self, index: int) -> K:
+        return self._keys[index]
+
+    def rank(self, key: K) -> int:
+        return bisect_left(self._keys, key)
+
+    def floor(self, key: K) -> Optional[K]:
+        index = bisect_right(self._keys, key)
+        return self._keys[index - 1] if index else None
+
+    def ceiling(self, key: K) -> Optional[K]:
+        index = bisect_left(self._keys, key)
+        return self._keys[index] if index < len(self._keys) else None
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._keys)
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        return zip(self._keys, self._values)
+
+    def iter_range(self, lo: Optional[K] = None, hi: Optional[K] = None, reverse: bool = False) -> Iterator[Tuple[K, V]]:
+        start = 0 if lo is None else bisect_left(self._keys, lo)
+        end = len(self._keys) if hi is None else bisect_right(self._keys, hi)
+        indexes = range(end - 1, start - 1, -1) if reverse else range(start, end)
+        for index in indexes:
+            yield self._keys[index], self._values[index]
+
+    def inorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        if visit:
+            for value in self._values:
+                visit(value)
+        return self._keys.tolist()
+
+    def preorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        return self._emit(self._preorder_slots(), visit)
+
+    def postorder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        # Reverse of a root-right-left preorder.
+        slots: List[int] = []
+        stack = [(0, len(self._keys))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            slots.append(mid)
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+        slots.reverse()
+        return self._emit(slots, visit)
+
+    def bforder(self, visit: Optional[Callable[[V], None]] = None) -> List[K]:
+        slots: List[int] = []
+        queue = deque([(0, len(self._keys))])
+        while queue:
+            lo, hi = queue.popleft()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            slots.append(mid)
+            queue.append((lo, mid))
+            queue.append((mid + 1, hi))
+        return self._emit(slots, visit)
+
+    def _preorder_slots(self) -> List[int]:
+        slots: List[int] = []
+        stack = [(0, len(self._keys))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            slots.append(mid)
+            stack.append((mid + 1, hi))
+            stack.append((lo, mid))
+        return slots
+
+    def _emit(self, slots: List[int], visit: Optional[Callable[[V], None]]) -> List[K]:
+        if visit:
+            for slot in slots:
+                visit(self._values[slot])
+        return [self._keys[slot] for slot in slots]
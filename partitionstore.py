@@ -0,0 +1,87 @@
+from __future__ import annotations
+import mmap
+import os
+import struct
+from array import array
+from itertools import islice
+from typing import Dict, List, Tuple
+from datastructures.intervaltree import IntervalTree
+
+# Snapshot of one price partition for worker processes: a header, then the
+# lows and highs (float64) and global ids (int64) of its intervals, each
+# count * 8 bytes in native byte order. Files are only ever read on the host
+# that wrote them.
+MAGIC = b"PARTSNAP"
+HEADER = struct.Struct("=8sQ")
+
+def write_partition(path: str, lows: array, highs: array, ids: array) -> None:
+    # Written beside the target and renamed over it, so a worker never maps a
+    # half-written file.
+    partial = path + ".partial"
+    with open(partial, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(ids)))
+        lows.tofile(file)
+        highs.tofile(file)
+        ids.tofile(file)
+    os.replace(partial, path)
+
+
+class Partition:
+    # Worker-side tree for one snapshot. Tree values are positions in the
+    # snapshot; ids and lows map them back to global ids and home partitions.
+    def __init__(self, path: str):
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            magic, count = HEADER.unpack_from(view)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a partition snapshot")
+            columns = view[HEADER.size:HEADER.size + 24 * count]
+            lows, highs = columns[:8 * count].cast("d"), columns[8 * count:16 * count].cast("d")
+            self.tree = IntervalTree.from_intervals(zip(lows, highs, range(count)))
+            self.lows = array("d", lows)
+            self.ids = array("q", columns[16 * count:].cast("q"))
+            for buffer in (lows, highs, columns, view):
+                buffer.release()
+
+
+# Per worker process: snapshot path -> (version, loaded partition).
+_partitions: Dict[str, Tuple[int, Partition]] = {}
+
+def _load(path: str, version: int) -> Partition:
+    cached = _partitions.get(path)
+    if cached is None or cached[0] != version:
+        cached = _partitions[path] = (version, Partition(path))
+    return cached[1]
+
+def range_query_task(path: str, version: int, bounds: Tuple[float, float],
+                     windows: List[Tuple[float, float]]) -> List[List[int]]:
+    # Intervals are replicated into every partition they overlap, so each
+    # match is reported only by the partition holding the start of its
+    # overlap with the window.
+    partition = _load(path, version)
+    results = []
+    for low, high in windows:
+        found = []
+        for position in partition.tree.overlaps(low, high):
+            if bounds[0] <= max(partition.lows[position], low) < bounds[1]:
+                found.append(partition.ids[position])
+        results.append(found)
+    return results
+
+def top_k_task(path: str, version: int, bounds: Tuple[float, float], ks: List[int]) -> List[List[int]]:
+    # Intervals whose low lies in this partition, highest low first. Copies
+    # replicated from lower partitions have smaller lows, so they sort last.
+    partition = _load(path, version)
+    results = []
+    for k in ks:
+        found = [position for position in partition.tree.top_k(k) if partition.lows[position] >= bounds[0]]
+        results.append([partition.ids[position] for position in found])
+    return results
+
+def bottom_k_task(path: str, version: int, bounds: Tuple[float, float], ks: List[int]) -> List[List[int]]:
+    partition = _load(path, version)
+    results = []
+    for k in ks:
+        home = (position for _, _, position in partition.tree.intervals() if partition.lows[position] >= bounds[0])
+        results.append([partition.ids[position] for position in islice(home, k)])
+    return results
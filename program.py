@@ -1,7 +1,21 @@
-from datetime import datetime
-from typing import List, Tuple, Optional
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from heapq import merge
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Set, Tuple, Optional, Union
+from datastructures.alerts import Alert, AlertBook, Subscription
+from datastructures.ingest import Tick
 from datastructures.intervaltree import IntervalTree
-from datastructures.avltree import AVLTree
+from datastructures.partitionstore import bottom_k_task, range_query_task, top_k_task, write_partition
+from datastructures.querycache import MISSING, CacheStats, QueryCache
+from datastructures.rwlock import RWLock
+from datastructures.timeseries import Aggregate, Bar, TimeSeries, TimeSeriesSlice
 
 class Stock:
     def __init__(self, symbol: str, name: str, low: int, high: int):
@@ -11,54 +25,513 @@ class Stock:
         self.high = high
 
 class StockManager:
-    def __init__(self):
+    def __init__(self, cache_size: int = 0, cache_ttl: Optional[float] = None):
         self._interval_tree = IntervalTree()
-        self._price_history = {}  # Dictionary to store AVL trees for price history
-        stocks = [
-            Stock("GOOGL", "ALPHABET INC", 173, 213),
-        ]
-        for stock in stocks:
-            self.add_stock(stock)
+        self._symbols: Dict[str, Stock] = {}  # symbol -> the Stock stored in the interval tree
+        self._price_history: Dict[str, TimeSeries] = {}  # symbol -> tick history
+        self._alerts = AlertBook()  # range watches, checked against every tick
+        # Query results are only cached when cache_size is given. Cached
+        # range_query windows are indexed by their own bounds so a write only
+        # invalidates the windows it overlaps.
+        self._cache = QueryCache(cache_size, cache_ttl, on_discard=self._forget_query) if cache_size else None
+        self._cached_windows = IntervalTree()
+        self._cached_rankings = set()
+        self.add_stocks(_default_stocks())
 
     def add_stock(self, stock: Stock):
+        # Adding a symbol that is already tracked replaces its stock.
+        self.delete_stock(stock.symbol)
         self._interval_tree.insert(stock.low, stock.high, stock)
+        self._symbols[stock.symbol] = stock
+        self._invalidate(stock.low, stock.high)
+
+    def add_stocks(self, stocks: Iterable[Stock]):
+        latest = {stock.symbol: stock for stock in stocks}
+        for symbol in latest:
+            self.delete_stock(symbol)
+        self._interval_tree.extend((stock.low, stock.high, stock) for stock in latest.values())
+        self._symbols.update(latest)
+        if self._cache is not None:
+            self._cache.clear()
 
     def delete_stock(self, symbol: str):
         stock = self._find_stock(symbol)
         if stock:
-            self._interval_tree.delete(stock.low, stock.high)
+            del self._symbols[symbol]
+            self._interval_tree.delete(stock.low, stock.high, stock)
+            self._invalidate(stock.low, stock.high)
 
     def update_stock(self, symbol: str, new_low: int, new_high: int):
         stock = self._find_stock(symbol)
         if stock:
             self._interval_tree.update(stock.low, stock.high, new_low, new_high, stock)
+            self._invalidate(stock.low, stock.high)
+            stock.low, stock.high = new_low, new_high
+            self._invalidate(new_low, new_high)
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._cache.stats if self._cache is not None else None
+
+    def _invalidate(self, low: int, high: int):
+        # Drops exactly the cached results a write to [low, high] could change:
+        # range windows overlapping it, and top/bottom-k lists that are short
+        # or whose cut-off low is on the wrong side of low.
+        if self._cache is None:
+            return
+        for key in list(self._cached_windows.overlaps(low, high)):
+            self._cache.invalidate(key)
+        for key in list(self._cached_rankings):
+            kind, k = key
+            result = self._cache.peek(key)
+            if len(result) < k or (result and (low >= result[-1].low if kind == "top" else low <= result[-1].low)):
+                self._cache.invalidate(key)
+
+    def _forget_query(self, key: Hashable):
+        if key[0] == "range":
+            self._cached_windows.delete(key[1], key[2], key)
+        else:
+            self._cached_rankings.discard(key)
+
+    def _cached(self, key: Hashable, compute) -> List[Stock]:
+        if self._cache is None:
+            return compute()
+        result = self._cache.get(key)
+        if result is MISSING:
+            result = compute()
+            if key not in self._cache:
+                if key[0] == "range":
+                    self._cached_windows.insert(key[1], key[2], key)
+                else:
+                    self._cached_rankings.add(key)
+            self._cache.put(key, result)
+        # Callers get their own list so they cannot alter the cached one.
+        return list(result)
+
+    def track_market_trends(self, symbol: str, start: Union[datetime, int, None] = None,
+                            end: Union[datetime, int, None] = None) -> TimeSeriesSlice:
+        # Ticks between start and end inclusive, as (timestamp ns, price) pairs.
+        history = self._price_history.get(symbol)
+        if history is None:
+            return TimeSeriesSlice([])
+        return history.slice(_to_ns(start), _to_ns(end))
+
+    def aggregate(self, symbol: str, start: Union[datetime, int, None] = None,
+                  end: Union[datetime, int, None] = None) -> Aggregate:
+        # Count, sum, min, max, mean and VWAP of the ticks between start and end.
+        history = self._price_history.get(symbol)
+        if history is None:
+            return Aggregate()
+        return history.aggregate(_to_ns(start), _to_ns(end))
+
+    def ohlc(self, symbol: str, bucket: Union[timedelta, int], start: Union[datetime, int, None] = None,
+             end: Union[datetime, int, None] = None) -> Iterator[Bar]:
+        history = self._price_history.get(symbol)
+        if history is None:
+            return iter(())
+        if isinstance(bucket, timedelta):
+            bucket = bucket // timedelta(microseconds=1) * 1000
+        return history.ohlc(bucket, _to_ns(start), _to_ns(end))
 
-    def track_market_trends(self, symbol: str) -> List[Tuple[datetime, int]]:
-        avl_tree = self._price_history.get(symbol)
-        if avl_tree:
-            return avl_tree.get(symbol)
-        return []
+    def _add_price_data(self, symbol: str, price: float, timestamp: Optional[int] = None, volume: float = 1.0):
+        history = self._price_history.get(symbol)
+        if history is None:
+            history = self._price_history[symbol] = TimeSeries()
+        if timestamp is None:
+            # The wall clock can step backwards; never let it reorder ticks.
+            timestamp = max(time.time_ns(), history.last_timestamp or 0)
+        history.append(timestamp, price, volume)
+        self._alerts.fire(symbol, price, timestamp)
 
-    def _add_price_data(self, symbol: str, price: int):
-        timestamp = datetime.now()
-        if symbol not in self._price_history:
-            self._price_history[symbol] = AVLTree()
-        self._price_history[symbol].insert(timestamp, price)
+    def subscribe(self, symbol: str, low: float, high: float, callback: Optional[Callable[[Alert], Any]] = None,
+                  queue: Any = None) -> Subscription:
+        # Every later tick of symbol priced within [low, high] produces an
+        # Alert for callback and/or queue (anything with put_nowait), until
+        # the subscription is cancelled.
+        return self._alerts.subscribe(symbol, low, high, callback, queue)
+
+    def subscribe_many(self, watches: Iterable[Tuple[str, float, float]], callback: Optional[Callable[[Alert], Any]] = None,
+                       queue: Any = None) -> List[Subscription]:
+        return self._alerts.subscribe_many(watches, callback, queue)
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        return self._alerts.unsubscribe(subscription_id)
+
+    def apply_ticks(self, ticks: Iterable[Tick]) -> int:
+        # Applies a batch of ticks in one pass. Ticks are grouped by symbol so
+        # each history is looked up once, and only a symbol's last new range
+        # reaches the interval tree. Ticks older than their symbol's history
+        # are dropped; returns how many were.
+        by_symbol: Dict[str, List[Tick]] = {}
+        for tick in ticks:
+            group = by_symbol.get(tick.symbol)
+            if group is None:
+                by_symbol[tick.symbol] = [tick]
+            else:
+                group.append(tick)
+        now = time.time_ns()
+        dropped = 0
+        for symbol, group in by_symbol.items():
+            history = self._price_history.get(symbol)
+            if history is None:
+                history = self._price_history[symbol] = TimeSeries()
+            last = history.last_timestamp or 0
+            timestamps, prices, volumes = [], [], []
+            latest_range = None
+            for tick in group:
+                timestamp = max(now, last) if tick.timestamp is None else tick.timestamp
+                if timestamp < last:
+                    dropped += 1
+                    continue
+                timestamps.append(timestamp)
+                prices.append(tick.price)
+                volumes.append(tick.volume)
+                last = timestamp
+                if tick.low is not None:
+                    latest_range = tick
+            history.extend(timestamps, prices, volumes)
+            if self._alerts.watches(symbol):
+                for timestamp, price in zip(timestamps, prices):
+                    self._alerts.fire(symbol, price, timestamp)
+            if latest_range is not None:
+                self.update_stock(symbol, latest_range.low, latest_range.high)
+        return dropped
+
+    def get_stock(self, symbol: str) -> Optional[Stock]:
+        return self._find_stock(symbol)
 
     def _find_stock(self, symbol: str) -> Optional[Stock]:
-        for node in self._interval_tree.range_query(float('-inf'), float('inf')):
-            if node.symbol == symbol:
-                return node
-        return None
+        return self._symbols.get(symbol)
+
+    def range_query(self, low: int, high: int) -> List[Stock]:
+        return self._cached(("range", low, high), lambda: self._interval_tree.range_query(low, high))
+
+    def top_k_stocks(self, k: int) -> List[Stock]:
+        return self._cached(("top", k), lambda: self._interval_tree.top_k_stocks(k))
+
+    def bottom_k_stocks(self, k: int) -> List[Stock]:
+        return self._cached(("bottom", k), lambda: self._interval_tree.bottom_k_stocks(k))
+
+class IntervalShard:
+    # One price band's stocks, keyed in the tree by their low. max_end mirrors
+    # the tree's and is refreshed by every write, so readers can skip a band
+    # that ends below their window without taking its lock.
+    def __init__(self):
+        self.lock = RWLock()
+        self.tree = IntervalTree()
+        self.max_end = float('-inf')
+
+    def refresh(self):
+        self.max_end = self.tree.root.max_end if self.tree.root else float('-inf')
+
+
+class SymbolShard:
+    # One hash slice of the symbol index and of the price histories.
+    def __init__(self):
+        self.lock = RWLock()
+        self.symbols: Dict[str, Stock] = {}
+        self.price_history: Dict[str, TimeSeries] = {}
+
+
+class ConcurrentStockManager:
+    # StockManager for many reader threads alongside writer threads. Stocks
+    # are sharded into interval trees by the price band their low falls in,
+    # symbols and price histories by symbol hash, and every shard has its
+    # own reader-writer lock, so a write only blocks readers of the shards
+    # it touches. Queries spanning shards lock them one at a time: each shard
+    # is read consistently, but a concurrent write may be seen in one shard
+    # and not yet in another.
+    def __init__(self, price_bands: Sequence[int] = (50, 100, 150, 200, 300, 500), symbol_shards: int = 16):
+        # price_bands are the sorted boundaries between interval shards.
+        self._bands = list(price_bands)
+        self._interval_shards = [IntervalShard() for _ in range(len(self._bands) + 1)]
+        self._symbol_shards = [SymbolShard() for _ in range(symbol_shards)]
+        self.add_stocks(_default_stocks())
+
+    def _interval_shard(self, low: int) -> IntervalShard:
+        return self._interval_shards[bisect_right(self._bands, low)]
+
+    def _symbol_shard(self, symbol: str) -> SymbolShard:
+        return self._symbol_shards[hash(symbol) % len(self._symbol_shards)]
+
+    def add_stock(self, stock: Stock):
+        shard = self._symbol_shard(stock.symbol)
+        with shard.lock.write():
+            self._remove(shard, stock.symbol)
+            target = self._interval_shard(stock.low)
+            with target.lock.write():
+                target.tree.insert(stock.low, stock.high, stock)
+                target.refresh()
+            shard.symbols[stock.symbol] = stock
+
+    def add_stocks(self, stocks: Iterable[Stock]):
+        for stock in {stock.symbol: stock for stock in stocks}.values():
+            self.add_stock(stock)
+
+    def delete_stock(self, symbol: str):
+        shard = self._symbol_shard(symbol)
+        with shard.lock.write():
+            self._remove(shard, symbol)
+
+    def _remove(self, shard: SymbolShard, symbol: str):
+        # Caller holds shard's write lock.
+        stock = shard.symbols.pop(symbol, None)
+        if stock:
+            source = self._interval_shard(stock.low)
+            with source.lock.write():
+                source.tree.delete(stock.low, stock.high, stock)
+                source.refresh()
+
+    def update_stock(self, symbol: str, new_low: int, new_high: int):
+        shard = self._symbol_shard(symbol)
+        with shard.lock.write():
+            stock = shard.symbols.get(symbol)
+            if not stock:
+                return
+            source, target = self._interval_shard(stock.low), self._interval_shard(new_low)
+            if source is target:
+                with source.lock.write():
+                    source.tree.update(stock.low, stock.high, new_low, new_high, stock)
+                    source.refresh()
+                    stock.low, stock.high = new_low, new_high
+                return
+            # Lock both trees in band order so crossing moves cannot deadlock.
+            first, second = sorted((source, target), key=self._interval_shards.index)
+            with first.lock.write(), second.lock.write():
+                source.tree.delete(stock.low, stock.high, stock)
+                target.tree.insert(new_low, new_high, stock)
+                source.refresh()
+                target.refresh()
+                stock.low, stock.high = new_low, new_high
+
+    def get_stock(self, symbol: str) -> Optional[Stock]:
+        shard = self._symbol_shard(symbol)
+        with shard.lock.read():
+            return shard.symbols.get(symbol)
 
     def range_query(self, low: int, high: int) -> List[Stock]:
-        return [node for node in self._interval_tree.range_query(low, high)]
+        # Stocks sit in the band of their low, so bands above high are skipped.
+        result: List[Stock] = []
+        for shard in self._interval_shards[:bisect_right(self._bands, high) + 1]:
+            if shard.max_end < low:
+                continue
+            with shard.lock.read():
+                result.extend(shard.tree.range_query(low, high))
+        return result
 
     def top_k_stocks(self, k: int) -> List[Stock]:
-        return [node for node in self._interval_tree.top_k_stocks(k)]
+        result: List[Stock] = []
+        for shard in reversed(self._interval_shards):
+            if len(result) >= k:
+                break
+            with shard.lock.read():
+                result.extend(shard.tree.top_k(k - len(result)))
+        return result
 
     def bottom_k_stocks(self, k: int) -> List[Stock]:
-        return [node for node in self._interval_tree.bottom_k_stocks(k)]
+        result: List[Stock] = []
+        for shard in self._interval_shards:
+            if len(result) >= k:
+                break
+            with shard.lock.read():
+                result.extend(shard.tree.bottom_k(k - len(result)))
+        return result
+
+    def track_market_trends(self, symbol: str, start: Union[datetime, int, None] = None,
+                            end: Union[datetime, int, None] = None) -> TimeSeriesSlice:
+        shard = self._symbol_shard(symbol)
+        with shard.lock.read():
+            history = shard.price_history.get(symbol)
+            return history.slice(_to_ns(start), _to_ns(end)) if history else TimeSeriesSlice([])
+
+    def aggregate(self, symbol: str, start: Union[datetime, int, None] = None,
+                  end: Union[datetime, int, None] = None) -> Aggregate:
+        shard = self._symbol_shard(symbol)
+        with shard.lock.read():
+            history = shard.price_history.get(symbol)
+            return history.aggregate(_to_ns(start), _to_ns(end)) if history else Aggregate()
+
+    def ohlc(self, symbol: str, bucket: Union[timedelta, int], start: Union[datetime, int, None] = None,
+             end: Union[datetime, int, None] = None) -> Iterator[Bar]:
+        if isinstance(bucket, timedelta):
+            bucket = bucket // timedelta(microseconds=1) * 1000
+        shard = self._symbol_shard(symbol)
+        with shard.lock.read():
+            history = shard.price_history.get(symbol)
+            # Built under the lock, since the generator would run after it.
+            bars = list(history.ohlc(bucket, _to_ns(start), _to_ns(end))) if history else []
+        return iter(bars)
+
+    def _add_price_data(self, symbol: str, price: float, timestamp: Optional[int] = None, volume: float = 1.0):
+        shard = self._symbol_shard(symbol)
+        with shard.lock.write():
+            history = shard.price_history.get(symbol)
+            if history is None:
+                history = shard.price_history[symbol] = TimeSeries()
+            if timestamp is None:
+                timestamp = max(time.time_ns(), history.last_timestamp or 0)
+            history.append(timestamp, price, volume)
+
+
+class ParallelStockManager:
+    # Answers batches of range_query/top_k_stocks/bottom_k_stocks on a pool
+    # of worker processes. The price domain is cut at boundaries into
+    # contiguous partitions and each stock is replicated into every partition
+    # its range overlaps. Writes only touch this process; before a batch, each
+    # changed partition is written to a snapshot file that workers map and
+    # build their own tree from, so stocks are never pickled across. Workers
+    # return integer ids, which are turned back into Stock objects here.
+    def __init__(self, boundaries: Sequence[float] = (100, 200, 300), max_workers: Optional[int] = None):
+        self._bounds = list(boundaries)
+        partitions = len(self._bounds) + 1
+        self._members: List[Set[int]] = [set() for _ in range(partitions)]
+        self._versions = [0] * partitions
+        self._dirty = set(range(partitions))
+        self._stocks: Dict[int, Stock] = {}
+        self._ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._directory = tempfile.mkdtemp(prefix="stock-partitions-")
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        # Also runs if the manager is dropped or the interpreter exits
+        # without close(), so neither the workers nor the snapshots leak.
+        self._finalizer = weakref.finalize(self, _release_partitions, self._pool, self._directory)
+        self.add_stocks(_default_stocks())
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self) -> 'ParallelStockManager':
+        return self
+
+    def __exit__(self, *exc_info: object):
+        self.close()
+
+    def _partitions(self, low: float, high: float) -> range:
+        return range(bisect_right(self._bounds, low), bisect_right(self._bounds, high) + 1)
+
+    def _bounds_of(self, partition: int) -> Tuple[float, float]:
+        low = self._bounds[partition - 1] if partition else float('-inf')
+        high = self._bounds[partition] if partition < len(self._bounds) else float('inf')
+        return low, high
+
+    def _path(self, partition: int) -> str:
+        return os.path.join(self._directory, f"partition-{partition}.snap")
+
+    def add_stock(self, stock: Stock):
+        self.delete_stock(stock.symbol)
+        stock_id = self._ids[stock.symbol] = self._next_id
+        self._next_id += 1
+        self._stocks[stock_id] = stock
+        self._place(stock_id, stock)
+
+    def add_stocks(self, stocks: Iterable[Stock]):
+        for stock in stocks:
+            self.add_stock(stock)
+
+    def delete_stock(self, symbol: str):
+        stock_id = self._ids.pop(symbol, None)
+        if stock_id is not None:
+            self._unplace(stock_id, self._stocks.pop(stock_id))
+
+    def update_stock(self, symbol: str, new_low: int, new_high: int):
+        stock_id = self._ids.get(symbol)
+        if stock_id is not None:
+            stock = self._stocks[stock_id]
+            self._unplace(stock_id, stock)
+            stock.low, stock.high = new_low, new_high
+            self._place(stock_id, stock)
+
+    def get_stock(self, symbol: str) -> Optional[Stock]:
+        stock_id = self._ids.get(symbol)
+        return self._stocks[stock_id] if stock_id is not None else None
+
+    def _place(self, stock_id: int, stock: Stock):
+        for partition in self._partitions(stock.low, stock.high):
+            self._members[partition].add(stock_id)
+            self._dirty.add(partition)
+
+    def _unplace(self, stock_id: int, stock: Stock):
+        for partition in self._partitions(stock.low, stock.high):
+            self._members[partition].discard(stock_id)
+            self._dirty.add(partition)
+
+    def _publish(self):
+        for partition in sorted(self._dirty):
+            stocks = [(stock_id, self._stocks[stock_id]) for stock_id in self._members[partition]]
+            write_partition(self._path(partition), array("d", [stock.low for _, stock in stocks]),
+                            array("d", [stock.high for _, stock in stocks]), array("q", [stock_id for stock_id, _ in stocks]))
+            self._versions[partition] += 1
+        self._dirty.clear()
+
+    def range_query_batch(self, windows: Iterable[Tuple[int, int]]) -> List[List[Stock]]:
+        windows = list(windows)
+        self._publish()
+        asked: Dict[int, List[int]] = {}  # partition -> indexes of the windows it overlaps
+        for index, (low, high) in enumerate(windows):
+            for partition in self._partitions(low, high):
+                asked.setdefault(partition, []).append(index)
+        futures = {partition: self._pool.submit(range_query_task, self._path(partition), self._versions[partition],
+                                                self._bounds_of(partition), [windows[index] for index in indexes])
+                   for partition, indexes in asked.items()}
+        found: List[List[List[int]]] = [[] for _ in windows]
+        for partition, indexes in asked.items():
+            for index, ids in zip(indexes, futures[partition].result()):
+                found[index].append(ids)
+        # Each partition answers in low order; merge them back into one.
+        low_of = lambda stock_id: self._stocks[stock_id].low
+        stocks = self._stocks
+        return [[stocks[stock_id] for stock_id in (parts[0] if len(parts) == 1 else merge(*parts, key=low_of))]
+                for parts in found]
+
+    def top_k_batch(self, ks: Iterable[int]) -> List[List[Stock]]:
+        return self._ranked_batch(top_k_task, list(ks), reverse=True)
+
+    def bottom_k_batch(self, ks: Iterable[int]) -> List[List[Stock]]:
+        return self._ranked_batch(bottom_k_task, list(ks), reverse=False)
+
+    def _ranked_batch(self, task, ks: List[int], reverse: bool) -> List[List[Stock]]:
+        # Every partition ranks the stocks whose low it holds; partitions are
+        # disjoint in low, so results just concatenate in partition order.
+        self._publish()
+        partitions = range(len(self._members))
+        futures = [self._pool.submit(task, self._path(partition), self._versions[partition],
+                                     self._bounds_of(partition), ks) for partition in partitions]
+        answers = [future.result() for future in futures]
+        if reverse:
+            answers.reverse()
+        results = []
+        for index, k in enumerate(ks):
+            ids: List[int] = []
+            for answer in answers:
+                if len(ids) >= k:
+                    break
+                ids.extend(answer[index])
+            results.append([self._stocks[stock_id] for stock_id in ids[:k]])
+        return results
+
+    def range_query(self, low: int, high: int) -> List[Stock]:
+        return self.range_query_batch([(low, high)])[0]
+
+    def top_k_stocks(self, k: int) -> List[Stock]:
+        return self.top_k_batch([k])[0]
+
+    def bottom_k_stocks(self, k: int) -> List[Stock]:
+        return self.bottom_k_batch([k])[0]
+
+
+def _release_partitions(pool: ProcessPoolExecutor, directory: str):
+    pool.shutdown()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def _default_stocks() -> List[Stock]:
+    return [
+        Stock("GOOGL", "ALPHABET INC", 173, 213),
+    ]
+
+def _to_ns(moment: Union[datetime, int, None]) -> Optional[int]:
+    if isinstance(moment, datetime):
+        return round(moment.timestamp() * 1_000_000) * 1000
+    return moment
 
 def main():
     manager = StockManager()
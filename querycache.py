@@ -0,0 +1,84 @@
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class QueryCache:
+    # Bounded LRU cache whose entries optionally expire ttl seconds after
+    # being stored. on_discard(key) is called whenever an entry leaves the
+    # cache other than by being overwritten, so owners can drop any side
+    # index they keep for invalidation.
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 on_discard: Optional[Callable[[Hashable], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._on_discard = on_discard
+        self._clock = clock
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        expires, value = entry
+        if expires < self._clock():
+            self.stats.misses += 1
+            self.stats.expirations += 1
+            self._discard(key)
+            return default
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = MISSING) -> Any:
+        # Reads without touching recency, expiry or statistics.
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = self._clock() + self._ttl if self._ttl is not None else float('inf')
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self.stats.evictions += 1
+            self._discard(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable) -> bool:
+        if key not in self._entries:
+            return False
+        self.stats.invalidations += 1
+        self._discard(key)
+        return True
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self.invalidate(key)
+
+    def _discard(self, key: Hashable) -> None:
+        del self._entries[key]
+        if self._on_discard:
+            self._on_discard(key)
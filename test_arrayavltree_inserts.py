@@ -0,0 +1,50 @@
+import pytest
+
+from datastructures.arrayavltree import ArrayAVLTree
+
+class TestArrayAVLInserts():
+    @pytest.fixture
+    def avltree(self) -> ArrayAVLTree:
+        tree = ArrayAVLTree[int, int]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node, node)
+        return tree
+
+    def test_insert_bforder(self, avltree: ArrayAVLTree) -> None: assert avltree.bforder() == [5, 3, 8, 2, 4, 6, 9, 1, 7, 10]
+    def test_insert_inorder(self, avltree: ArrayAVLTree) -> None: assert avltree.inorder() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    def test_insert_preorder(self, avltree: ArrayAVLTree) -> None: assert avltree.preorder() == [5, 3, 2, 1, 4, 8, 6, 7, 9, 10]
+    def test_insert_postorder(self, avltree: ArrayAVLTree) -> None: assert avltree.postorder() == [1, 2, 4, 3, 7, 6, 10, 9, 8, 5]
+    def test_size(self, avltree: ArrayAVLTree) -> None: assert avltree.size() == 10
+    def test_delete(self, avltree: ArrayAVLTree) -> None:
+        avltree.delete(5)
+        assert avltree.size() == 9
+        assert avltree.bforder() == [6, 3, 8, 2, 4, 7, 9, 1, 10]
+        assert avltree.inorder() == [1, 2, 3, 4, 6, 7, 8, 9, 10]
+        assert avltree.preorder() == [6, 3, 2, 1, 4, 8, 7, 9, 10]
+        assert avltree.postorder() == [1, 2, 4, 3, 7, 10, 9, 8, 6]
+    def test_insert(self, avltree: ArrayAVLTree) -> None:
+        avltree.insert(11, 11)
+        assert avltree.size() == 11
+        assert avltree.bforder() == [5, 3, 8, 2, 4, 6, 10, 1, 7, 9, 11]
+        assert avltree.inorder() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+        assert avltree.preorder() == [5, 3, 2, 1, 4, 8, 6, 7, 10, 9, 11]
+        assert avltree.postorder() == [1, 2, 4, 3, 7, 6, 9, 11, 10, 8, 5]
+    def test_search(self, avltree: ArrayAVLTree) -> None:
+        assert avltree.search(7) == 7
+        assert avltree.search(42) is None
+    def test_visit(self, avltree: ArrayAVLTree) -> None:
+        values = []
+        avltree.postorder(values.append)
+        assert values == [1, 2, 4, 3, 7, 6, 10, 9, 8, 5]
+    def test_deleted_slots_are_reused(self, avltree: ArrayAVLTree) -> None:
+        avltree.delete(5)
+        avltree.delete(9)
+        avltree.insert(12, 12)
+        avltree.insert(13, 13)
+        avltree.insert(14, 14)
+        assert len(avltree._keys) == 11
+        assert avltree.inorder() == [1, 2, 3, 4, 6, 7, 8, 10, 12, 13, 14]
+    def test_float_keys_and_values(self) -> None:
+        tree = ArrayAVLTree[float, float]([(2.5, 20.0), (1.5, 10.0), (3.5, 30.0)], typecode="d", value_typecode="d")
+        assert tree.inorder() == [1.5, 2.5, 3.5]
+        assert tree.search(3.5) == 30.0
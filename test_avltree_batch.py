@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from datastructures.avltree import AVLTree
+
+class TestAVLBatch():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        tree = AVLTree[int, int]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node, node)
+        return tree
+
+    def _assert_valid(self, tree: AVLTree) -> None:
+        def _check(node) -> int:
+            if not node:
+                return 0
+            left, right = _check(node.left), _check(node.right)
+            assert abs(left - right) <= 1
+            assert node.size == 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+            return 1 + max(left, right)
+        _check(tree._root)
+
+    def test_search_many_keeps_input_order(self, avltree: AVLTree) -> None: assert avltree.search_many([7, 42, 1, 7, 10]) == [7, None, 1, 7, 10]
+    def test_search_many_empty(self, avltree: AVLTree) -> None: assert avltree.search_many([]) == []
+    def test_search_many_on_empty_tree(self) -> None: assert AVLTree[int, int]().search_many([1, 2]) == [None, None]
+    def test_insert_many_small_batch(self, avltree: AVLTree) -> None:
+        avltree.insert_many([(11, 11)])
+        assert avltree.bforder() == [5, 3, 8, 2, 4, 6, 10, 1, 7, 9, 11]
+    def test_insert_many_large_batch_rebuilds(self, avltree: AVLTree) -> None:
+        avltree.insert_many((node, node) for node in range(20000, 0, -2))
+        assert avltree.inorder() == sorted(list(range(1, 11)) + list(range(2, 20001, 2)))
+        assert avltree.size() == 10010
+        self._assert_valid(avltree)
+    def test_insert_many_into_empty_tree(self) -> None:
+        tree = AVLTree[int, int]()
+        tree.insert_many((node, node) for node in range(10000))
+        assert tree.inorder() == list(range(10000))
+        self._assert_valid(tree)
+    def test_delete_many_small_batch(self, avltree: AVLTree) -> None:
+        avltree.delete_many([5])
+        assert avltree.bforder() == [6, 3, 8, 2, 4, 7, 9, 1, 10]
+    def test_delete_many_large_batch_rebuilds(self) -> None:
+        tree = AVLTree[int, int].from_sorted((node, node) for node in range(10000))
+        tree.delete_many([*range(0, 10000, 3), *range(1, 10000, 3), 50000])
+        assert tree.inorder() == list(range(2, 10000, 3))
+        self._assert_valid(tree)
+    def test_delete_removes_first_of_equal_keys(self) -> None:
+        tree = AVLTree[int, str]()
+        for value in "abc":
+            tree.insert(5, value)
+        tree.delete(5)
+        assert [value for _, value in tree.items()] == ["b", "c"]
+    def test_delete_many_matches_delete_with_equal_keys(self) -> None:
+        rng = random.Random(351)
+        pairs = [(rng.randrange(40), i) for i in range(300)]
+        batched, looped = AVLTree[int, int](), AVLTree[int, int]()
+        for key, value in pairs:
+            batched.insert(key, value)
+            looped.insert(key, value)
+        doomed = [rng.randrange(50) for _ in range(300)]
+        assert batched._prefer_rebuild(len(doomed), batched.size())
+        batched.delete_many(doomed)
+        for key in doomed:
+            looped.delete(key)
+        assert list(batched.items()) == list(looped.items())
+        self._assert_valid(batched)
+    def test_batches_match_per_key_operations(self) -> None:
+        rng = random.Random(351)
+        keys = rng.sample(range(100_000), 5000)
+        batched = AVLTree[int, int]((key, key) for key in keys[:1000])
+        looped = AVLTree[int, int]((key, key) for key in keys[:1000])
+        for lo, hi in ((1000, 1010), (1010, 5000)):
+            batched.insert_many((key, key) for key in keys[lo:hi])
+            for key in keys[lo:hi]:
+                looped.insert(key, key)
+        doomed = rng.sample(keys, 4000)
+        batched.delete_many(doomed)
+        for key in doomed:
+            looped.delete(key)
+        assert batched.inorder() == looped.inorder()
+        probes = rng.sample(range(100_000), 2000)
+        assert batched.search_many(probes) == [looped.search(key) for key in probes]
+        self._assert_valid(batched)
@@ -0,0 +1,42 @@
+import pytest
+
+from datastructures.avltree import AVLTree
+
+class TestAVLBulkLoad():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        return AVLTree[int, int].from_sorted([(node, node) for node in range(1, 11)])
+
+    def _assert_balanced(self, tree: AVLTree) -> None:
+        def _check(node) -> int:
+            if not node:
+                return 0
+            left, right = _check(node.left), _check(node.right)
+            assert abs(left - right) <= 1
+            assert node.height == 1 + max(left, right)
+            return node.height
+        _check(tree._root)
+
+    def test_from_sorted_bforder(self, avltree: AVLTree) -> None: assert avltree.bforder() == [6, 3, 9, 2, 5, 8, 10, 1, 4, 7]
+    def test_from_sorted_inorder(self, avltree: AVLTree) -> None: assert avltree.inorder() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    def test_from_sorted_size(self, avltree: AVLTree) -> None: assert avltree.size() == 10
+    def test_from_sorted_balanced(self, avltree: AVLTree) -> None: self._assert_balanced(avltree)
+    def test_constructor_sorts_input(self) -> None:
+        tree = AVLTree[int, int]([(node, node * 10) for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]])
+        assert tree.inorder() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+        assert tree.bforder() == [6, 3, 9, 2, 5, 8, 10, 1, 4, 7]
+        assert tree.search(4) == 40
+        self._assert_balanced(tree)
+    def test_constructor_keeps_duplicates_in_input_order(self) -> None:
+        values = []
+        AVLTree[int, str]([(2, "b"), (1, "a"), (2, "c")]).inorder(values.append)
+        assert values == ["a", "b", "c"]
+    def test_insert_and_delete_after_bulk_load(self, avltree: AVLTree) -> None:
+        avltree.insert(11, 11)
+        avltree.delete(6)
+        assert avltree.inorder() == [1, 2, 3, 4, 5, 7, 8, 9, 10, 11]
+        self._assert_balanced(avltree)
+    def test_large_bulk_load_is_balanced(self) -> None:
+        tree = AVLTree[int, int].from_sorted((node, node) for node in range(1000))
+        assert tree.inorder() == list(range(1000))
+        self._assert_balanced(tree)
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from datastructures.avltree import AVLTree, DuplicatePolicy
+
+class TestAVLDuplicates():
+    def _assert_sizes(self, tree: AVLTree) -> None:
+        def _check(node) -> int:
+            if not node:
+                return 0
+            total = node.count + _check(node.left) + _check(node.right)
+            assert node.size == total
+            return total
+        _check(tree._root)
+
+    def test_allow_keeps_separate_nodes(self) -> None:
+        tree = AVLTree[int, str]()
+        for value in "abc":
+            tree.insert(1, value)
+        assert tree.inorder() == [1, 1, 1]
+        assert tree.bforder() == [1, 1, 1]
+    def test_replace_overwrites_value(self) -> None:
+        tree = AVLTree[int, str](duplicates=DuplicatePolicy.REPLACE)
+        tree.insert(1, "a")
+        tree.insert(2, "b")
+        tree.insert(1, "c")
+        assert tree.size() == 2
+        assert tree.search(1) == "c"
+    def test_reject_raises(self) -> None:
+        tree = AVLTree[int, str](duplicates=DuplicatePolicy.REJECT)
+        tree.insert(1, "a")
+        with pytest.raises(KeyError):
+            tree.insert(1, "b")
+        assert tree.search(1) == "a"
+        assert tree.size() == 1
+    def test_reject_bulk_load_raises(self) -> None:
+        with pytest.raises(KeyError):
+            AVLTree[int, str]([(1, "a"), (1, "b")], duplicates=DuplicatePolicy.REJECT)
+    @pytest.mark.parametrize("existing, batch", [(1000, 2), (2, 2000)])
+    def test_reject_insert_many_is_all_or_nothing(self, existing: int, batch: int) -> None:
+        # The small batch goes through per-key inserts, the large one through
+        # a rebuild; neither may leave part of a rejected batch behind.
+        tree = AVLTree[int, int]([(i, i) for i in range(existing)], duplicates=DuplicatePolicy.REJECT)
+        for pairs in ([(5000 + i, 0) for i in range(batch - 1)] + [(1, 9)],
+                      [(5000 + i % (batch - 1), 0) for i in range(batch)]):
+            with pytest.raises(KeyError):
+                tree.insert_many(pairs)
+            assert tree.size() == existing
+            assert tree.search(1) == 1
+            assert tree.search(5000) is None
+        tree.insert_many([(5000 + i, 0) for i in range(batch)])
+        assert tree.size() == existing + batch
+    def test_multiset_shares_one_node(self) -> None:
+        tree = AVLTree[int, str](duplicates=DuplicatePolicy.MULTISET)
+        for key, value in [(5, "a"), (3, "b"), (5, "c"), (5, "d")]:
+            tree.insert(key, value)
+        assert tree.bforder() == [5, 5, 5, 3]
+        assert tree._root.height == 2
+        assert tree.size() == 4
+        assert tree.count(5) == 3
+        assert tree.search(5) == "a"
+        assert tree.search_all(5) == ["a", "c", "d"]
+        assert list(tree.items()) == [(3, "b"), (5, "a"), (5, "c"), (5, "d")]
+        assert [tree.select(i) for i in range(4)] == [3, 5, 5, 5]
+        assert tree.rank(6) == 4
+    def test_multiset_delete_removes_oldest(self) -> None:
+        tree = AVLTree[int, str]([(5, "a"), (5, "c"), (3, "b")], duplicates=DuplicatePolicy.MULTISET)
+        tree.delete(5)
+        assert tree.search_all(5) == ["c"]
+        tree.delete(5)
+        assert tree.count(5) == 0
+        assert tree.inorder() == [3]
+    def test_multiset_bulk_load_groups_equal_keys(self) -> None:
+        tree = AVLTree[int, int].from_sorted([(key % 10, key) for key in range(100)], duplicates=DuplicatePolicy.MULTISET)
+        assert tree.bforder()[::10] == [5, 2, 8, 1, 4, 7, 9, 0, 3, 6]
+        assert tree.search_all(3) == list(range(3, 100, 10))
+        self._assert_sizes(tree)
+    def test_multiset_random_workload(self) -> None:
+        rng = random.Random(351)
+        tree = AVLTree[int, int](duplicates=DuplicatePolicy.MULTISET)
+        expected = []
+        for i in range(2000):
+            key = rng.randrange(200)
+            tree.insert(key, i)
+            expected.append(key)
+        for key in rng.sample(expected, 1500):
+            tree.delete(key)
+            expected.remove(key)
+        expected.sort()
+        self._assert_sizes(tree)
+        assert tree.inorder() == expected
+        assert [tree.select(i) for i in range(len(expected))] == expected
+        tree.insert_many((key, key) for key in range(200))
+        tree.delete_many(range(0, 200, 2))
+        self._assert_sizes(tree)
+        assert tree.size() == len(expected) + 100
@@ -0,0 +1,42 @@
+from itertools import islice
+
+import pytest
+
+from datastructures.avltree import AVLTree
+
+class TestAVLIterators():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        tree = AVLTree[int, int]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node * 10, node)
+        return tree
+
+    def test_iter(self, avltree: AVLTree) -> None: assert list(avltree) == avltree.inorder()
+    def test_iter_empty(self) -> None: assert list(AVLTree[int, int]()) == []
+    def test_items(self, avltree: AVLTree) -> None: assert list(avltree.items())[:3] == [(10, 1), (20, 2), (30, 3)]
+    def test_iter_range(self, avltree: AVLTree) -> None: assert list(avltree.iter_range(25, 60)) == [(30, 3), (40, 4), (50, 5), (60, 6)]
+    def test_iter_range_reverse(self, avltree: AVLTree) -> None: assert list(avltree.iter_range(25, 60, reverse=True)) == [(60, 6), (50, 5), (40, 4), (30, 3)]
+    def test_iter_range_open_bounds(self, avltree: AVLTree) -> None:
+        assert [key for key, _ in avltree.iter_range(hi=30)] == [10, 20, 30]
+        assert [key for key, _ in avltree.iter_range(lo=85, reverse=True)] == [100, 90]
+    def test_iter_range_empty_window(self, avltree: AVLTree) -> None: assert list(avltree.iter_range(41, 49)) == []
+    def test_iter_range_stops_early(self, avltree: AVLTree) -> None: assert [key for key, _ in islice(avltree.iter_range(lo=45), 2)] == [50, 60]
+    def test_floor(self, avltree: AVLTree) -> None:
+        assert avltree.floor(45) == 40
+        assert avltree.floor(40) == 40
+        assert avltree.floor(5) is None
+    def test_ceiling(self, avltree: AVLTree) -> None:
+        assert avltree.ceiling(45) == 50
+        assert avltree.ceiling(50) == 50
+        assert avltree.ceiling(105) is None
+    def test_successor(self, avltree: AVLTree) -> None:
+        assert avltree.successor(50) == 60
+        assert avltree.successor(100) is None
+    def test_predecessor(self, avltree: AVLTree) -> None:
+        assert avltree.predecessor(50) == 40
+        assert avltree.predecessor(10) is None
+    def test_range_matches_inorder_on_large_tree(self) -> None:
+        tree = AVLTree[int, int].from_sorted((node, node) for node in range(0, 2000, 3))
+        assert [key for key, _ in tree.iter_range(100, 1500)] == [key for key in range(0, 2000, 3) if 100 <= key <= 1500]
+        assert [key for key, _ in tree.iter_range(100, 1500, reverse=True)] == [key for key in range(1998, -1, -3) if 100 <= key <= 1500]
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from datastructures.avltree import AVLTree
+
+class TestAVLOrderStatistics():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        tree = AVLTree[int, int]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node, node)
+        return tree
+
+    def _assert_sizes(self, tree: AVLTree) -> None:
+        def _check(node) -> int:
+            if not node:
+                return 0
+            count = 1 + _check(node.left) + _check(node.right)
+            assert node.size == count
+            return count
+        _check(tree._root)
+
+    def test_size_tracks_inserts_and_deletes(self, avltree: AVLTree) -> None:
+        avltree.insert(11, 11)
+        assert avltree.size() == 11
+        avltree.delete(5)
+        avltree.delete(1)
+        assert avltree.size() == 9
+        avltree.delete(42)
+        assert avltree.size() == 9
+        self._assert_sizes(avltree)
+    def test_size_empty(self) -> None: assert AVLTree[int, int]().size() == 0
+    def test_select(self, avltree: AVLTree) -> None: assert [avltree.select(i) for i in range(10)] == avltree.inorder()
+    def test_select_negative_index(self, avltree: AVLTree) -> None: assert avltree.select(-1) == 10
+    def test_select_out_of_range(self, avltree: AVLTree) -> None:
+        with pytest.raises(IndexError):
+            avltree.select(10)
+    def test_rank(self, avltree: AVLTree) -> None:
+        assert avltree.rank(1) == 0
+        assert avltree.rank(5) == 4
+        assert avltree.rank(5.5) == 5
+        assert avltree.rank(100) == 10
+    def test_median(self, avltree: AVLTree) -> None:
+        assert avltree.median() == 5
+        avltree.insert(11, 11)
+        assert avltree.median() == 6
+    def test_percentile(self, avltree: AVLTree) -> None:
+        assert avltree.percentile(0) == 1
+        assert avltree.percentile(25) == 3
+        assert avltree.percentile(90) == 9
+        assert avltree.percentile(100) == 10
+    def test_percentile_out_of_range(self, avltree: AVLTree) -> None:
+        with pytest.raises(ValueError):
+            avltree.percentile(101)
+    def test_random_workload_matches_sorted_list(self) -> None:
+        rng = random.Random(351)
+        tree = AVLTree[int, int]()
+        keys = []
+        for _ in range(500):
+            key = rng.randrange(10_000)
+            if key not in keys:
+                tree.insert(key, key)
+                keys.append(key)
+        for key in rng.sample(keys, 200):
+            tree.delete(key)
+            keys.remove(key)
+        keys.sort()
+        self._assert_sizes(tree)
+        assert tree.size() == len(keys)
+        assert [tree.select(i) for i in range(len(keys))] == keys
+        assert all(tree.rank(key) == i for i, key in enumerate(keys))
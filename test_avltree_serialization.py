@@ -0,0 +1,108 @@
+import gc
+import warnings
+
+import pytest
+
+from datastructures.avltree import AVLTree, DuplicatePolicy
+from datastructures.mappedavltree import HEADER
+
+class TestAVLSerialization():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        tree = AVLTree[int, float]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node, node * 1.5)
+        return tree
+
+    @pytest.fixture
+    def dump_path(self, avltree: AVLTree, tmp_path) -> str:
+        path = str(tmp_path / "tree.avl")
+        avltree.dump(path)
+        return path
+
+    def _corrupt(self, path: str, offset: int) -> None:
+        with open(path, "r+b") as file:
+            file.seek(offset)
+            byte = file.read(1)
+            file.seek(offset)
+            file.write(bytes([byte[0] ^ 0xFF]))
+
+    def test_round_trip(self, avltree: AVLTree, dump_path: str) -> None:
+        loaded = AVLTree.load(dump_path)
+        assert list(loaded.items()) == list(avltree.items())
+        assert loaded.bforder() == AVLTree.from_sorted(avltree.items()).bforder()
+        loaded.insert(11, 16.5)
+        assert loaded.size() == 11
+    def test_round_trip_empty(self, tmp_path) -> None:
+        path = str(tmp_path / "empty.avl")
+        AVLTree[int, int]().dump(path)
+        assert AVLTree.load(path).size() == 0
+        with AVLTree.load(path, mmap=True) as mapped:
+            assert mapped.size() == 0
+            assert mapped.search(1) is None
+    def test_round_trip_multiset(self, tmp_path) -> None:
+        path = str(tmp_path / "multi.avl")
+        AVLTree[int, int]([(1, 10), (1, 11), (2, 20)], duplicates=DuplicatePolicy.MULTISET).dump(path)
+        loaded = AVLTree.load(path, duplicates=DuplicatePolicy.MULTISET)
+        assert loaded.search_all(1) == [10, 11]
+    def test_mmap_search(self, dump_path: str) -> None:
+        with AVLTree.load(dump_path, mmap=True) as mapped:
+            assert mapped.search(4) == 6.0
+            assert mapped.search(42) is None
+            assert mapped.size() == 10
+            assert mapped.floor(0) is None
+            assert mapped.ceiling(9.5) == 10
+            assert list(mapped.iter_range(3, 5, reverse=True)) == [(5, 7.5), (4, 6.0), (3, 4.5)]
+    def test_mmap_traversals_match_bulk_loaded_tree(self, avltree: AVLTree, dump_path: str) -> None:
+        built = AVLTree.from_sorted(avltree.items())
+        with AVLTree.load(dump_path, mmap=True) as mapped:
+            assert mapped.inorder() == built.inorder()
+            assert mapped.preorder() == built.preorder()
+            assert mapped.postorder() == built.postorder()
+            values = []
+            assert mapped.bforder(values.append) == built.bforder()
+            assert values == [key * 1.5 for key in built.bforder()]
+    def test_mmap_is_read_only(self, dump_path: str) -> None:
+        with AVLTree.load(dump_path, mmap=True) as mapped:
+            with pytest.raises(TypeError):
+                mapped.insert(11, 11.0)
+    def test_non_numeric_keys_rejected(self, tmp_path) -> None:
+        with pytest.raises(TypeError):
+            AVLTree[str, int]([("a", 1)]).dump(str(tmp_path / "bad.avl"))
+    def test_corrupt_payload_detected(self, dump_path: str) -> None:
+        self._corrupt(dump_path, HEADER.size + 3)
+        with pytest.raises(ValueError):
+            AVLTree.load(dump_path)
+        with pytest.raises(ValueError):
+            AVLTree.load(dump_path, mmap=True)
+    def test_corrupt_magic_detected(self, dump_path: str) -> None:
+        self._corrupt(dump_path, 0)
+        with pytest.raises(ValueError):
+            AVLTree.load(dump_path)
+    def test_truncated_file_detected(self, dump_path: str) -> None:
+        with open(dump_path, "r+b") as file:
+            file.truncate(HEADER.size + 20)
+        with pytest.raises(ValueError):
+            AVLTree.load(dump_path, mmap=True)
+        with open(dump_path, "r+b") as file:
+            file.truncate(10)
+        with pytest.raises(ValueError):
+            AVLTree.load(dump_path)
+    def test_empty_file_detected(self, tmp_path) -> None:
+        path = str(tmp_path / "empty.avl")
+        open(path, "wb").close()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            for mmap in (False, True):
+                with pytest.raises(ValueError, match="too short"):
+                    AVLTree.load(path, mmap=mmap)
+            gc.collect()
+        assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
+    def test_failed_mmap_load_releases_the_map(self, dump_path: str) -> None:
+        self._corrupt(dump_path, HEADER.size + 3)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with pytest.raises(ValueError, match="checksum"):
+                AVLTree.load(dump_path, mmap=True)
+            gc.collect()
+        assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from datastructures.avltree import AVLTree, DuplicatePolicy
+
+class TestAVLSnapshots():
+    @pytest.fixture
+    def avltree(self) -> AVLTree:
+        tree = AVLTree[int, int]()
+        for node in [8, 9, 10, 2, 1, 5, 3, 6, 4, 7]:
+            tree.insert(node, node)
+        return tree
+
+    def test_snapshot_shares_structure(self, avltree: AVLTree) -> None:
+        snapshot = avltree.snapshot()
+        assert snapshot._root is avltree._root
+    def test_snapshot_is_read_only(self, avltree: AVLTree) -> None:
+        snapshot = avltree.snapshot()
+        with pytest.raises(TypeError):
+            snapshot.insert(11, 11)
+        with pytest.raises(TypeError):
+            snapshot.delete(5)
+    def test_snapshot_unaffected_by_insert(self, avltree: AVLTree) -> None:
+        snapshot = avltree.snapshot()
+        avltree.insert(11, 11)
+        assert snapshot.bforder() == [5, 3, 8, 2, 4, 6, 9, 1, 7, 10]
+        assert snapshot.size() == 10
+        assert avltree.bforder() == [5, 3, 8, 2, 4, 6, 10, 1, 7, 9, 11]
+    def test_snapshot_unaffected_by_delete(self, avltree: AVLTree) -> None:
+        snapshot = avltree.snapshot()
+        avltree.delete(5)
+        assert snapshot.bforder() == [5, 3, 8, 2, 4, 6, 9, 1, 7, 10]
+        assert avltree.bforder() == [6, 3, 8, 2, 4, 7, 9, 1, 10]
+    def test_write_copies_only_the_modified_path(self, avltree: AVLTree) -> None:
+        snapshot = avltree.snapshot()
+        avltree.insert(11, 11)
+        assert avltree._root is not snapshot._root
+        assert avltree._root.left is snapshot._root.left
+    def test_snapshot_of_multiset_bucket(self) -> None:
+        tree = AVLTree[int, str]([(1, "a")], duplicates=DuplicatePolicy.MULTISET)
+        snapshot = tree.snapshot()
+        tree.insert(1, "b")
+        assert snapshot.search_all(1) == ["a"]
+        assert tree.search_all(1) == ["a", "b"]
+    def test_snapshot_of_multiset_bucket_pulled_up_by_delete(self) -> None:
+        tree = AVLTree[int, str](duplicates=DuplicatePolicy.MULTISET)
+        for key, value in [(2, "x"), (1, "y"), (3, "a"), (3, "b")]:
+            tree.insert(key, value)
+        snapshot = tree.snapshot()
+        tree.delete(2)
+        tree.delete(3)
+        assert snapshot.inorder() == [1, 2, 3, 3]
+        assert snapshot.search_all(3) == ["a", "b"]
+        assert tree.inorder() == [1, 3]
+        assert tree.search_all(3) == ["b"]
+    def test_many_snapshots_under_random_writes(self) -> None:
+        rng = random.Random(351)
+        tree = AVLTree[int, int]()
+        live = set()
+        snapshots = []
+        for step in range(3000):
+            key = rng.randrange(500)
+            if key in live:
+                tree.delete(key)
+                live.discard(key)
+            else:
+                tree.insert(key, key)
+                live.add(key)
+            if step % 300 == 0:
+                snapshots.append((tree.snapshot(), sorted(live)))
+        assert tree.inorder() == sorted(live)
+        for snapshot, expected in snapshots:
+            assert snapshot.inorder() == expected
+            assert snapshot.size() == len(expected)
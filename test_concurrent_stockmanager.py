@@ -0,0 +1,113 @@
+import random
+import threading
+import unittest
+
+from datastructures.rwlock import RWLock
+from program import ConcurrentStockManager, Stock, StockManager
+
+class TestConcurrentStockManager(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(351)
+        self.concurrent = ConcurrentStockManager(price_bands=(100, 200, 300), symbol_shards=4)
+        self.plain = StockManager()
+        for i in range(400):
+            low = self.rng.randrange(400)
+            high = low + self.rng.randrange(150)
+            for manager in (self.concurrent, self.plain):
+                manager.add_stock(Stock(f"S{i}", f"Stock {i}", low, high))
+
+    def symbols(self, stocks):
+        return sorted(stock.symbol for stock in stocks)
+
+    def assertSameAnswers(self):
+        for low, high in ((0, 10), (150, 160), (250, 420), (1000, 2000)):
+            self.assertEqual(self.symbols(self.concurrent.range_query(low, high)), self.symbols(self.plain.range_query(low, high)))
+        for k in (1, 20, 500):
+            self.assertEqual([s.low for s in self.concurrent.top_k_stocks(k)], [s.low for s in self.plain.top_k_stocks(k)])
+            self.assertEqual([s.low for s in self.concurrent.bottom_k_stocks(k)], [s.low for s in self.plain.bottom_k_stocks(k)])
+
+    def test_matches_stock_manager(self):
+        self.assertSameAnswers()
+        for i in self.rng.sample(range(400), 150):
+            new_low = self.rng.randrange(400)
+            new_high = new_low + self.rng.randrange(150)
+            for manager in (self.concurrent, self.plain):
+                manager.update_stock(f"S{i}", new_low, new_high)
+        for i in self.rng.sample(range(400), 50):
+            for manager in (self.concurrent, self.plain):
+                manager.delete_stock(f"S{i}")
+        self.assertSameAnswers()
+        self.assertIsNone(self.concurrent.get_stock("NOPE"))
+
+    def test_price_history(self):
+        for second, price in enumerate([100, 110, 90]):
+            self.concurrent._add_price_data("S1", price, second)
+        self.assertEqual([price for _, price in self.concurrent.track_market_trends("S1", 1, 2)], [110, 90])
+        self.assertEqual(self.concurrent.aggregate("S1").high, 110)
+        self.assertEqual(len(list(self.concurrent.ohlc("S1", 2))), 2)
+        self.assertEqual(self.concurrent.aggregate("S2").count, 0)
+
+    def test_readers_alongside_writer(self):
+        errors = []
+        done = threading.Event()
+
+        def read():
+            try:
+                while not done.is_set():
+                    for stock in self.concurrent.range_query(100, 200):
+                        self.assertIsNotNone(stock.symbol)
+                    self.concurrent.top_k_stocks(5)
+            except Exception as error:
+                errors.append(error)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        rng = random.Random(7)
+        moves = []
+        for _ in range(2000):
+            i, new_low = rng.randrange(400), rng.randrange(400)
+            moves.append((i, new_low))
+            self.concurrent.update_stock(f"S{i}", new_low, new_low + 10)
+            self.concurrent._add_price_data(f"S{i}", new_low)
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(errors, [])
+        for i, new_low in moves:
+            self.plain.update_stock(f"S{i}", new_low, new_low + 10)
+        self.assertSameAnswers()
+
+class TestRWLock(unittest.TestCase):
+
+    def test_readers_share_writers_exclude(self):
+        lock = RWLock()
+        inside = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.read():
+                inside.wait()
+
+        threads = [threading.Thread(target=read) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(inside.broken)
+        state = []
+
+        def read_once():
+            with lock.read():
+                state.append("read")
+
+        with lock.write():
+            reader = threading.Thread(target=read_once)
+            reader.start()
+            reader.join(0.05)
+            self.assertTrue(reader.is_alive())
+        reader.join()
+        self.assertEqual(state, ["read"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from datastructures.ingest import Tick, TickIngestor, parse_tick, replay
+from program import Stock, StockManager
+
+async def from_list(ticks):
+    for tick in ticks:
+        yield tick
+
+class TestTickIngestor(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.manager = StockManager()
+        self.manager.add_stock(Stock("AAPL", "APPLE INC", 150, 200))
+
+    async def test_applies_every_tick_and_last_range(self):
+        ticks = [Tick("AAPL", 150 + i % 7, i, low=100 + i, high=300 + i) for i in range(50)]
+        ticks += [Tick("MSFT", 60.0, i) for i in range(30)]
+        stats = await TickIngestor(self.manager, batch_size=16).run(from_list(ticks))
+        self.assertEqual((stats.ticks, stats.batches, stats.dropped), (80, 5, 0))
+        self.assertEqual([price for _, price in self.manager.track_market_trends("AAPL")], [150 + i % 7 for i in range(50)])
+        self.assertEqual(len(self.manager.track_market_trends("MSFT")), 30)
+        aapl = self.manager.get_stock("AAPL")
+        self.assertEqual((aapl.low, aapl.high), (149, 349))
+        self.assertEqual(len(stats.latencies), 5)
+        self.assertLessEqual(stats.latency(50), stats.latency(99))
+
+    async def test_drops_ticks_older_than_history(self):
+        self.manager._add_price_data("AAPL", 1.0, 100)
+        ticks = [Tick("AAPL", 2.0, 99), Tick("AAPL", 3.0, 100), Tick("AAPL", 4.0, 50, low=1, high=2), Tick("AAPL", 5.0)]
+        stats = await TickIngestor(self.manager).run(from_list(ticks))
+        self.assertEqual(stats.dropped, 2)
+        self.assertEqual([price for _, price in self.manager.track_market_trends("AAPL")], [1.0, 3.0, 5.0])
+        self.assertEqual(self.manager.get_stock("AAPL").low, 150)
+
+    async def test_slow_feed_is_flushed_after_max_delay(self):
+        visible = []
+
+        async def slow():
+            yield Tick("AAPL", 170.0, 1)
+            yield Tick("AAPL", 171.0, 2)
+            await asyncio.sleep(0.05)
+            visible.append(len(self.manager.track_market_trends("AAPL")))
+            yield Tick("AAPL", 172.0, 3)
+
+        stats = await TickIngestor(self.manager, batch_size=1000, max_delay=0.005).run(slow())
+        self.assertEqual(visible, [2])
+        self.assertEqual((stats.ticks, stats.batches), (3, 2))
+
+    async def test_backpressure_bounds_unapplied_ticks(self):
+        manager = self.manager
+        read = 0
+        behind = []
+
+        class SlowSink:
+            def apply_ticks(self, ticks):
+                behind.append(read - len(manager.track_market_trends("AAPL")))
+                return manager.apply_ticks(ticks)
+
+        async def fast():
+            nonlocal read
+            for i in range(400):
+                read += 1
+                yield Tick("AAPL", 160.0, i)
+
+        stats = await TickIngestor(SlowSink(), batch_size=10, max_pending=2).run(fast())
+        self.assertEqual(stats.ticks, 400)
+        self.assertLessEqual(stats.max_queued, 2)
+        # At most the queued batches plus the one being filled and the one being applied.
+        self.assertLessEqual(max(behind), 4 * 10)
+
+    async def test_replay_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ticks.csv")
+            with open(path, "w") as file:
+                file.write("AAPL,170.5,1,3\n\nAAPL,171,2,,120,220\nMSFT,60,5\n")
+            stats = await TickIngestor(self.manager).run(replay(path, lines_per_yield=1))
+        self.assertEqual(stats.ticks, 3)
+        self.assertEqual(self.manager.aggregate("AAPL").volume, 4.0)
+        self.assertEqual(self.manager.get_stock("AAPL").high, 220)
+
+    def test_parse_tick(self):
+        self.assertEqual(parse_tick("AAPL,1.5\n"), Tick("AAPL", 1.5))
+        self.assertEqual(parse_tick("AAPL,1.5,7,2,1,3"), Tick("AAPL", 1.5, 7, 2.0, 1.0, 3.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import random
+import unittest
+
+from datastructures.intervaltree import IntervalTree
+
+class TestStaticIntervalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(351)
+        self.tree = IntervalTree()
+        for i in range(1000):
+            low = self.rng.randrange(10_000)
+            self.tree.insert(low, low + self.rng.randrange(300), i)
+        self.index = self.tree.freeze()
+
+    def test_freeze_keeps_every_interval_in_low_order(self):
+        self.assertEqual(len(self.index), 1000)
+        self.assertEqual(list(self.index.lows), sorted(self.index.lows))
+
+    def test_stab_many_matches_tree_stab(self):
+        points = [self.rng.randrange(-100, 10_500) for _ in range(500)]
+        offsets, indices = self.index.stab_many(points)
+        self.assertEqual(len(offsets), len(points) + 1)
+        for j, point in enumerate(points):
+            found = [self.index.values[i] for i in indices[offsets[j]:offsets[j + 1]]]
+            self.assertEqual(sorted(found), sorted(self.tree.stab(point)))
+
+    def test_stab_many_empty_inputs(self):
+        offsets, indices = self.index.stab_many([])
+        self.assertEqual(list(offsets), [0])
+        offsets, indices = IntervalTree().freeze().stab_many([1, 2])
+        self.assertEqual(list(offsets), [0, 0, 0])
+        self.assertEqual(len(indices), 0)
+
+    def test_stab_many_endpoints_are_inclusive(self):
+        tree = IntervalTree()
+        tree.insert(10, 20, "a")
+        tree.insert(20, 30, "b")
+        offsets, indices = tree.freeze().stab_many([20, 9, 30, 10])
+        self.assertEqual(list(offsets), [0, 2, 2, 3, 4])
+        self.assertEqual(list(indices), [0, 1, 1, 0])
+
+if __name__ == "__main__":
+    unittest.main()
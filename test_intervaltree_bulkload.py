@@ -0,0 +1,71 @@
+import random
+import unittest
+from math import log2
+
+from datastructures.intervaltree import IntervalTree
+
+class TestIntervalTreeBulkLoad(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(351)
+        self.intervals = []
+        for i in range(3000):
+            low = rng.randrange(5000)
+            self.intervals.append((low, low + rng.randrange(200), i))
+
+    def check(self, node):
+        # Returns (height, max_end, min_low) after asserting node's augmentation.
+        if not node:
+            return 0, float('-inf'), float('inf')
+        left, right = self.check(node.left), self.check(node.right)
+        self.assertLessEqual(abs(left[0] - right[0]), 1)
+        own_high = node.key[1]
+        if node.intervals_at_low is not None:
+            own_high = max(own_high, node.intervals_at_low.select(-1))
+        self.assertEqual(node.height, 1 + max(left[0], right[0]))
+        self.assertEqual(node.max_end, max(own_high, left[1], right[1]))
+        self.assertEqual(node.min_low, min(node.key[0], left[2], right[2]))
+        return node.height, node.max_end, node.min_low
+
+    def test_from_intervals_matches_inserts(self):
+        tree = IntervalTree.from_intervals(self.intervals)
+        self.check(tree.root)
+        self.assertEqual(tree.size(), len(self.intervals))
+        inserted = IntervalTree()
+        for interval in self.intervals:
+            inserted.insert(*interval)
+        self.assertEqual(list(tree.intervals()), list(inserted.intervals()))
+        self.assertEqual(sorted(tree.stab(2500)), sorted(inserted.stab(2500)))
+
+    def test_from_intervals_is_perfectly_balanced(self):
+        tree = IntervalTree.from_intervals((i, i + 1, i) for i in range(1023))
+        self.assertEqual(tree.root.height, 10)
+
+    def test_from_intervals_empty(self):
+        tree = IntervalTree.from_intervals([])
+        self.assertIsNone(tree.root)
+        self.assertEqual(tree.size(), 0)
+
+    def test_extend_rebuilds_for_large_batch(self):
+        tree = IntervalTree.from_intervals(self.intervals[:10])
+        tree.extend(self.intervals[10:])
+        self.check(tree.root)
+        self.assertEqual(tree.root.height, int(log2(len({low for low, _, _ in self.intervals}))) + 1)
+        self.assertEqual(sorted(tree.intervals()), sorted(self.intervals))
+
+    def test_extend_inserts_small_batch(self):
+        tree = IntervalTree.from_intervals(self.intervals[:2990])
+        tree.extend(self.intervals[2990:])
+        self.check(tree.root)
+        self.assertEqual(tree.size(), len(self.intervals))
+        self.assertEqual(sorted(tree.intervals()), sorted(self.intervals))
+
+    def test_size_tracks_deletes(self):
+        tree = IntervalTree.from_intervals(self.intervals)
+        low, high, value = self.intervals[0]
+        tree.delete(low, high, value)
+        tree.delete(low, high, value)
+        self.assertEqual(tree.size(), len(self.intervals) - 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+from math import log2
+
+from datastructures.intervaltree import IntervalTree
+
+class TestIntervalTreeQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(351)
+        self.intervals = []
+        self.tree = IntervalTree()
+        for i in range(2000):
+            low = self.rng.randrange(100_000)
+            high = low + self.rng.randrange(200)
+            self.intervals.append((low, high, i))
+            self.tree.insert(low, high, i)
+
+    def _expected(self, predicate):
+        return sorted(i for low, high, i in self.intervals if predicate(low, high))
+
+    def test_stab(self):
+        for point in self.rng.sample(range(100_000), 50):
+            self.assertEqual(sorted(self.tree.stab(point)), self._expected(lambda low, high: low <= point <= high))
+
+    def test_overlaps(self):
+        for lo in self.rng.sample(range(100_000), 50):
+            hi = lo + self.rng.randrange(500)
+            self.assertEqual(sorted(self.tree.overlaps(lo, hi)), self._expected(lambda low, high: low <= hi and high >= lo))
+            self.assertEqual(sorted(self.tree.range_query(lo, hi)), self._expected(lambda low, high: low <= hi and high >= lo))
+
+    def test_contained_in(self):
+        for lo in self.rng.sample(range(100_000), 50):
+            hi = lo + self.rng.randrange(1000)
+            self.assertEqual(sorted(self.tree.contained_in(lo, hi)), self._expected(lambda low, high: lo <= low and high <= hi))
+
+    def test_contains(self):
+        for lo in self.rng.sample(range(100_000), 50):
+            hi = lo + self.rng.randrange(50)
+            self.assertEqual(sorted(self.tree.contains(lo, hi)), self._expected(lambda low, high: low <= lo and high >= hi))
+
+    def test_results_are_lazy_and_in_low_order(self):
+        results = self.tree.overlaps(0, 100_000)
+        first = [next(results) for _ in range(5)]
+        self.assertEqual(first, [i for _, _, i in sorted(self.intervals)[:5]])
+
+    def test_min_low_augmentation(self):
+        def check(node):
+            if not node:
+                return float('inf')
+            expected = min(node.key[0], check(node.left), check(node.right))
+            self.assertEqual(node.min_low, expected)
+            return expected
+        for low, high, i in self.intervals[:500]:
+            self.tree.delete(low, high)
+        check(self.tree.root)
+
+    def test_negative_endpoints(self):
+        tree = IntervalTree()
+        tree.insert(-50, -10, "a")
+        tree.insert(-5, 5, "b")
+        self.assertEqual(list(tree.stab(-20)), ["a"])
+        self.assertEqual(list(tree.stab(-7)), [])
+
+    def test_stab_visits_logarithmic_nodes(self):
+        for point in self.rng.sample(range(100_000), 50):
+            self.tree.nodes_visited = 0
+            found = len(list(self.tree.stab(point)))
+            self.assertLessEqual(self.tree.nodes_visited, 4 * log2(len(self.intervals)) + 3 * found)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import random
+import unittest
+from math import log2
+
+from datastructures.intervaltree import IntervalTree
+
+class TestIntervalTreeSharedLows(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = IntervalTree()
+        self.tree.insert(100, 150, "a")
+        self.tree.insert(100, 300, "b")
+        self.tree.insert(100, 150, "c")
+        self.tree.insert(200, 250, "d")
+
+    def height(self, node):
+        return 1 + max(self.height(node.left), self.height(node.right)) if node else 0
+
+    def test_one_node_per_distinct_low(self):
+        self.assertEqual(self.height(self.tree.root), 2)
+        self.assertEqual(sorted(self.tree.intervals()),
+                         [(100, 150, "a"), (100, 150, "c"), (100, 300, "b"), (200, 250, "d")])
+
+    def test_max_end_includes_shared_intervals(self):
+        self.assertEqual(self.tree.root.max_end, 300)
+        self.assertEqual(sorted(self.tree.stab(275)), ["b"])
+
+    def test_delete_removes_exact_interval(self):
+        self.tree.delete(100, 300)
+        self.assertEqual(self.tree.root.max_end, 250)
+        self.assertEqual(sorted(self.tree.stab(120)), ["a", "c"])
+
+    def test_delete_by_value(self):
+        self.tree.delete(100, 150, "c")
+        self.assertEqual(sorted(self.tree.stab(120)), ["a", "b"])
+        self.tree.delete(100, 150, "a")
+        self.assertEqual(sorted(self.tree.stab(120)), ["b"])
+        self.tree.delete(100, 150, "missing")
+        self.assertEqual(sorted(self.tree.stab(120)), ["b"])
+
+    def test_delete_missing_high_is_noop(self):
+        self.tree.delete(100, 999)
+        self.assertEqual(len(list(self.tree.intervals())), 4)
+
+    def test_random_round_number_lows(self):
+        rng = random.Random(351)
+        tree = IntervalTree()
+        intervals = []
+        for i in range(2000):
+            low = rng.randrange(50) * 10
+            intervals.append((low, low + rng.randrange(1, 40), i))
+            tree.insert(*intervals[-1])
+        self.assertLessEqual(self.height(tree.root), 1.45 * log2(50) + 2)
+        rng.shuffle(intervals)
+        for low, high, i in intervals[:1500]:
+            tree.delete(low, high, i)
+        remaining = intervals[1500:]
+        self.assertEqual(sorted(tree.intervals()), sorted(remaining))
+        for point in range(0, 540, 7):
+            expected = sorted(i for low, high, i in remaining if low <= point <= high)
+            self.assertEqual(sorted(tree.stab(point)), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from datastructures.intervaltree import IntervalTree
+
+METRICS = {
+    "low": lambda low, high, value: low,
+    "high": lambda low, high, value: high,
+    "width": lambda low, high, value: high - low,
+    "midpoint": lambda low, high, value: (low + high) / 2,
+}
+
+class TestIntervalTreeTopK(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(351)
+        self.tree = IntervalTree()
+        self.intervals = []
+        for i in range(2000):
+            low = self.rng.randrange(0, 1000, 5)
+            interval = (low, low + self.rng.randrange(100), i)
+            self.intervals.append(interval)
+            self.tree.insert(*interval)
+
+    def expected(self, metric, reverse, k, overlapping=None):
+        candidates = self.intervals
+        if overlapping:
+            candidates = [iv for iv in candidates if iv[0] <= overlapping[1] and iv[1] >= overlapping[0]]
+        ranked = sorted(candidates, key=lambda iv: metric(*iv), reverse=reverse)
+        return [metric(*iv) for iv in ranked[:k]]
+
+    def ranks(self, values, metric):
+        by_value = {i: (low, high, i) for low, high, i in self.intervals}
+        return [metric(*by_value[value]) for value in values]
+
+    def test_builtin_metrics(self):
+        for name, metric in METRICS.items():
+            for k in (1, 10, 250):
+                self.assertEqual(self.ranks(self.tree.top_k(k, key=name), metric), self.expected(metric, True, k))
+                self.assertEqual(self.ranks(self.tree.bottom_k(k, key=name), metric), self.expected(metric, False, k))
+
+    def test_overlapping_restriction(self):
+        for overlapping in ((180, 220), (0, 0), (950, 5000), (-10, -1)):
+            for key in ("width", "high", "low", METRICS["midpoint"]):
+                metric = key if callable(key) else METRICS[key]
+                self.assertEqual(self.ranks(self.tree.top_k(10, key=key, overlapping=overlapping), metric),
+                                 self.expected(metric, True, 10, overlapping))
+                self.assertEqual(self.ranks(self.tree.bottom_k(10, key=key, overlapping=overlapping), metric),
+                                 self.expected(metric, False, 10, overlapping))
+
+    def test_custom_key(self):
+        metric = lambda low, high, value: value % 97
+        self.assertEqual(self.ranks(self.tree.top_k(20, key=metric), metric), self.expected(metric, True, 20))
+
+    def test_pruned_search_visits_few_nodes(self):
+        self.tree.nodes_visited = 0
+        self.tree.top_k(5, key="width")
+        self.assertLess(self.tree.nodes_visited, 100)
+
+    def test_max_width_survives_deletes(self):
+        for low, high, i in self.intervals[:1500]:
+            self.tree.delete(low, high, i)
+        self.intervals = self.intervals[1500:]
+        width = METRICS["width"]
+        self.assertEqual(self.ranks(self.tree.top_k(30, key="width"), width), self.expected(width, True, 30))
+
+    def test_k_larger_than_tree_and_empty(self):
+        self.assertEqual(len(self.tree.top_k(5000, key="width")), 2000)
+        self.assertEqual(IntervalTree().top_k(3, key="high"), [])
+        self.assertEqual(self.tree.bottom_k(0), [])
+
+    def test_stock_helpers_follow_low_order(self):
+        self.assertEqual(self.tree.top_k_stocks(7), self.tree.top_k(7))
+        self.assertEqual(self.tree.bottom_k_stocks(7), self.tree.bottom_k(7))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import random
+import unittest
+
+from datastructures.intervaltree import IntervalTree
+
+class TestIntervalTreeUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(351)
+        self.intervals = {}
+        for i in range(1000):
+            low = self.rng.randrange(0, 2000, 4)
+            self.intervals[i] = (low, low + self.rng.randrange(100))
+        self.tree = IntervalTree.from_intervals((low, high, i) for i, (low, high) in self.intervals.items())
+
+    def nodes(self, node):
+        return 1 + self.nodes(node.left) + self.nodes(node.right) if node else 0
+
+    def check(self):
+        self.assertEqual(sorted(self.tree.intervals()), sorted((low, high, i) for i, (low, high) in self.intervals.items()))
+        self.assertEqual(self.tree.size(), len(self.intervals))
+        for point in range(0, 2200, 37):
+            expected = sorted(i for i, (low, high) in self.intervals.items() if low <= point <= high)
+            self.assertEqual(sorted(self.tree.stab(point)), expected)
+
+    def test_high_only_update_is_in_place(self):
+        root, nodes = self.tree.root, self.nodes(self.tree.root)
+        for i in self.rng.sample(range(1000), 300):
+            low, high = self.intervals[i]
+            new_high = low + self.rng.randrange(400)
+            self.tree.update(low, high, low, new_high, i)
+            self.intervals[i] = (low, new_high)
+        self.assertIs(self.tree.root, root)
+        self.assertEqual(self.nodes(self.tree.root), nodes)
+        self.check()
+
+    def test_widening_raises_max_end(self):
+        low, high = self.intervals[0]
+        self.tree.update(low, high, low, 10_000, 0)
+        self.intervals[0] = (low, 10_000)
+        self.assertEqual(self.tree.root.max_end, 10_000)
+        self.assertEqual(self.tree.top_k(1, key="width"), [0])
+        self.check()
+
+    def test_low_change_relocates(self):
+        for i in self.rng.sample(range(1000), 300):
+            low, high = self.intervals[i]
+            new_low = self.rng.randrange(0, 2000, 3)
+            self.tree.update(low, high, new_low, new_low + 10, i)
+            self.intervals[i] = (new_low, new_low + 10)
+        self.check()
+
+    def test_missing_interval_is_inserted(self):
+        self.tree.update(5000, 5010, 5000, 5020, "new")
+        self.assertEqual(list(self.tree.stab(5015)), ["new"])
+
+    def test_relocation_may_change_the_value(self):
+        tree = IntervalTree()
+        tree.insert(10, 20, "a")
+        tree.update(10, 20, 15, 30, "b")
+        self.assertEqual(list(tree.intervals()), [(15, 30, "b")])
+        for high, value in [(20, "c"), (20, "d"), (25, "e")]:
+            tree.insert(10, high, value)
+        # The interval holding the value is preferred, then the first stored.
+        tree.update(10, 20, 5, 20, "d")
+        tree.update(10, 20, 6, 20, "f")
+        self.assertEqual(sorted(tree.intervals()), [(5, 20, "d"), (6, 20, "f"), (10, 25, "e"), (15, 30, "b")])
+        self.assertEqual(tree.size(), 4)
+
+    def test_in_place_update_may_change_the_value(self):
+        tree = IntervalTree()
+        tree.insert(10, 20, "a")
+        tree.update(10, 20, 10, 30, "b")
+        self.assertEqual(list(tree.intervals()), [(10, 30, "b")])
+        self.assertEqual(tree.size(), 1)
+        for high, value in [(20, "c"), (20, "d"), (25, "e")]:
+            tree.insert(10, high, value)
+        # The interval holding the value is preferred, then the first stored.
+        tree.update(10, 20, 10, 40, "d")
+        tree.update(10, 25, 10, 50, "f")
+        tree.update(10, 30, 10, 60, "g")
+        self.assertEqual(sorted(tree.intervals()), [(10, 20, "c"), (10, 40, "d"), (10, 50, "f"), (10, 60, "g")])
+        self.assertEqual(tree.size(), 4)
+        self.assertEqual(tree.root.max_end, 60)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import gc
+import os
+import random
+import unittest
+
+from program import ParallelStockManager, Stock, StockManager
+
+class TestParallelStockManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parallel = ParallelStockManager(boundaries=(100, 200, 300), max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parallel.close()
+
+    def setUp(self):
+        rng = random.Random(351)
+        self.plain = StockManager()
+        for symbol in list(self.parallel._ids):
+            self.parallel.delete_stock(symbol)
+        for i in range(500):
+            low = rng.randrange(400)
+            high = low + rng.randrange(250)
+            for manager in (self.parallel, self.plain):
+                manager.add_stock(Stock(f"S{i}", f"Stock {i}", low, high))
+        self.parallel.add_stock(Stock("GOOGL", "ALPHABET INC", 173, 213))
+        self.windows = [(0, 10), (99, 101), (150, 350), (299, 300), (1000, 2000), (-50, 1000)]
+
+    def check(self):
+        batch = self.parallel.range_query_batch(self.windows)
+        for (low, high), found in zip(self.windows, batch):
+            expected = self.plain.range_query(low, high)
+            self.assertEqual(sorted(stock.symbol for stock in found), sorted(stock.symbol for stock in expected))
+            self.assertEqual([stock.low for stock in found], [stock.low for stock in expected])
+        ks = [1, 7, 600]
+        for k, found in zip(ks, self.parallel.top_k_batch(ks)):
+            self.assertEqual([stock.low for stock in found], [stock.low for stock in self.plain.top_k_stocks(k)])
+        for k, found in zip(ks, self.parallel.bottom_k_batch(ks)):
+            self.assertEqual([stock.low for stock in found], [stock.low for stock in self.plain.bottom_k_stocks(k)])
+
+    def test_matches_stock_manager(self):
+        self.check()
+
+    def test_writes_are_republished(self):
+        self.check()
+        rng = random.Random(7)
+        for i in rng.sample(range(500), 100):
+            new_low = rng.randrange(400)
+            new_high = new_low + rng.randrange(5, 250)
+            for manager in (self.parallel, self.plain):
+                manager.update_stock(f"S{i}", new_low, new_high)
+        self.check()
+
+    def test_single_queries(self):
+        self.assertEqual(sorted(s.symbol for s in self.parallel.range_query(150, 160)),
+                         sorted(s.symbol for s in self.plain.range_query(150, 160)))
+        self.assertEqual(len(self.parallel.top_k_stocks(3)), 3)
+        self.assertEqual(self.parallel.get_stock("S3").name, "Stock 3")
+
+    def test_dropped_manager_cleans_up(self):
+        manager = ParallelStockManager(max_workers=1)
+        directory, pool = manager._directory, manager._pool
+        manager.range_query(150, 160)
+        del manager
+        gc.collect()
+        self.assertFalse(os.path.exists(directory))
+        with self.assertRaises(RuntimeError):
+            pool.submit(int)
+
+if __name__ == "__main__":
+    unittest.main()
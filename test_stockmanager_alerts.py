@@ -0,0 +1,84 @@
+import asyncio
+import queue
+import random
+import unittest
+
+from datastructures.ingest import Tick
+from program import StockManager
+
+class TestStockManagerAlerts(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = StockManager()
+        self.alerts = []
+
+    def test_fires_only_inside_range(self):
+        watch = self.manager.subscribe("AAPL", 150, 160, self.alerts.append)
+        self.manager.subscribe("MSFT", 0, 1000, self.alerts.append)
+        for second, price in enumerate([149, 150, 155, 160, 161]):
+            self.manager._add_price_data("AAPL", price, second)
+        self.assertEqual([(alert.price, alert.timestamp) for alert in self.alerts], [(150, 1), (155, 2), (160, 3)])
+        self.assertTrue(all(alert.subscription is watch and alert.symbol == "AAPL" for alert in self.alerts))
+
+    def test_unsubscribe(self):
+        first = self.manager.subscribe("AAPL", 100, 200, self.alerts.append)
+        second = self.manager.subscribe("AAPL", 100, 200, self.alerts.append)
+        self.assertTrue(self.manager.unsubscribe(first.id))
+        self.assertFalse(self.manager.unsubscribe(first.id))
+        self.manager._add_price_data("AAPL", 150, 1)
+        self.assertEqual([alert.subscription for alert in self.alerts], [second])
+        self.manager.unsubscribe(second.id)
+        self.manager._add_price_data("AAPL", 150, 2)
+        self.assertEqual(len(self.alerts), 1)
+        self.assertFalse(self.manager._alerts.watches("AAPL"))
+
+    def test_callback_may_unsubscribe_itself(self):
+        def once(alert):
+            self.alerts.append(alert)
+            self.manager.unsubscribe(alert.subscription.id)
+        self.manager.subscribe("AAPL", 100, 200, once)
+        self.manager._add_price_data("AAPL", 150, 1)
+        self.manager._add_price_data("AAPL", 151, 2)
+        self.assertEqual(len(self.alerts), 1)
+
+    def test_queue_delivery_and_overflow(self):
+        alerts = queue.Queue(maxsize=2)
+        self.manager.subscribe("AAPL", 100, 200, queue=alerts)
+        for second in range(3):
+            self.manager._add_price_data("AAPL", 150, second)
+        self.assertEqual([alerts.get_nowait().timestamp for _ in range(2)], [0, 1])
+        self.assertEqual(self.manager._alerts.dropped, 1)
+        with self.assertRaises(ValueError):
+            self.manager.subscribe("AAPL", 100, 200)
+        with self.assertRaises(ValueError):
+            self.manager.subscribe("AAPL", 200, 100, self.alerts.append)
+
+    def test_asyncio_queue_with_ingested_ticks(self):
+        async def scenario():
+            alerts = asyncio.Queue()
+            self.manager.subscribe("AAPL", 150, 160, queue=alerts)
+            dropped = self.manager.apply_ticks([Tick("AAPL", 140.0, 1), Tick("AAPL", 155.0, 2),
+                                                Tick("MSFT", 155.0, 3), Tick("AAPL", 158.0, 4)])
+            self.assertEqual(dropped, 0)
+            return [(await alerts.get()).price for _ in range(alerts.qsize())]
+        self.assertEqual(asyncio.run(scenario()), [155.0, 158.0])
+
+    def test_many_subscriptions_match_scan(self):
+        rng = random.Random(351)
+        watches = []
+        for _ in range(3000):
+            low = rng.randrange(0, 1000)
+            watches.append((rng.choice(["AAPL", "MSFT"]), low, low + rng.randrange(0, 50)))
+        subscriptions = self.manager.subscribe_many(watches, self.alerts.append)
+        for subscription in subscriptions[::3]:
+            self.manager.unsubscribe(subscription.id)
+        active = subscriptions[1::3] + subscriptions[2::3]
+        for second in range(50):
+            price = rng.randrange(0, 1050)
+            self.alerts.clear()
+            self.manager._add_price_data("MSFT", price, second)
+            expected = {s.id for s in active if s.symbol == "MSFT" and s.low <= price <= s.high}
+            self.assertEqual({alert.subscription.id for alert in self.alerts}, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+
+from program import Stock, StockManager
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestStockManagerCache(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(351)
+        self.manager = StockManager(cache_size=64)
+        self.plain = StockManager()
+        for i in range(300):
+            low = rng.randrange(1000)
+            high = low + rng.randrange(50)
+            for manager in (self.manager, self.plain):
+                manager.add_stock(Stock(f"S{i}", f"Stock {i}", low, high))
+        self.stats = self.manager.cache_stats()
+
+    def symbols(self, stocks):
+        return sorted(stock.symbol for stock in stocks)
+
+    def assertSameAnswers(self):
+        for low, high in ((100, 150), (400, 420), (900, 2000)):
+            self.assertEqual(self.symbols(self.manager.range_query(low, high)), self.symbols(self.plain.range_query(low, high)))
+        for k in (1, 5, 400):
+            self.assertEqual([s.low for s in self.manager.top_k_stocks(k)], [s.low for s in self.plain.top_k_stocks(k)])
+            self.assertEqual([s.low for s in self.manager.bottom_k_stocks(k)], [s.low for s in self.plain.bottom_k_stocks(k)])
+
+    def test_cache_is_opt_in(self):
+        self.assertIsNone(self.plain.cache_stats())
+
+    def test_repeated_queries_hit(self):
+        first = self.manager.range_query(100, 150)
+        self.assertEqual(self.manager.range_query(100, 150), first)
+        self.manager.top_k_stocks(5)
+        self.manager.top_k_stocks(5)
+        self.assertEqual((self.stats.hits, self.stats.misses), (2, 2))
+
+    def test_unrelated_write_keeps_entries(self):
+        self.manager.range_query(100, 150)
+        self.manager.top_k_stocks(3)
+        self.manager.bottom_k_stocks(3)
+        self.manager.add_stock(Stock("NEW", "New", 500, 510))
+        self.manager.range_query(100, 150)
+        self.manager.top_k_stocks(3)
+        self.manager.bottom_k_stocks(3)
+        self.assertEqual(self.stats.invalidations, 0)
+        self.assertEqual(self.stats.hits, 3)
+
+    def test_overlapping_writes_invalidate(self):
+        self.assertSameAnswers()
+        for manager in (self.manager, self.plain):
+            manager.add_stock(Stock("NEW", "New", 140, 410))
+            manager.add_stock(Stock("TOP", "Top", 5000, 5001))
+            manager.add_stock(Stock("BOTTOM", "Bottom", -1, 0))
+            manager.delete_stock("S7")
+        self.assertGreater(self.stats.invalidations, 0)
+        self.assertSameAnswers()
+
+    def test_lru_eviction(self):
+        manager = StockManager(cache_size=2)
+        manager.range_query(0, 1)
+        manager.range_query(2, 3)
+        manager.range_query(0, 1)
+        manager.range_query(4, 5)
+        manager.range_query(0, 1)
+        stats = manager.cache_stats()
+        self.assertEqual(stats.evictions, 1)
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(len(list(manager._cached_windows.intervals())), 2)
+
+    def test_ttl_expiry(self):
+        manager = StockManager(cache_size=8, cache_ttl=5.0)
+        clock = FakeClock()
+        manager._cache._clock = clock
+        manager.range_query(0, 300)
+        clock.now = 4.0
+        manager.range_query(0, 300)
+        clock.now = 10.0
+        manager.range_query(0, 300)
+        stats = manager.cache_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.expirations), (1, 2, 1))
+
+if __name__ == "__main__":
+    unittest.main()
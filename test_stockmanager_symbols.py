@@ -0,0 +1,47 @@
+import unittest
+
+from program import Stock, StockManager
+
+class TestStockManagerSymbols(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = StockManager()
+        self.manager.add_stocks([
+            Stock("AAPL", "APPLE INC", 150, 200),
+            Stock("MSFT", "MICROSOFT CORP", 50, 150),
+            Stock("ORCL", "ORACLE CORP", 150, 210),
+        ])
+
+    def symbols(self, stocks):
+        return sorted(stock.symbol for stock in stocks)
+
+    def test_lookup(self):
+        self.assertEqual(self.manager.get_stock("MSFT").name, "MICROSOFT CORP")
+        self.assertIsNone(self.manager.get_stock("NOPE"))
+
+    def test_delete_removes_only_that_symbol(self):
+        self.manager.delete_stock("AAPL")
+        self.assertIsNone(self.manager.get_stock("AAPL"))
+        self.assertEqual(self.symbols(self.manager.range_query(180, 190)), ["GOOGL", "ORCL"])
+        self.manager.delete_stock("AAPL")
+        self.assertEqual(self.symbols(self.manager.range_query(0, 1000)), ["GOOGL", "MSFT", "ORCL"])
+
+    def test_update_moves_stock_and_keeps_index(self):
+        self.manager.update_stock("AAPL", 300, 320)
+        stock = self.manager.get_stock("AAPL")
+        self.assertEqual((stock.low, stock.high), (300, 320))
+        self.assertEqual(self.symbols(self.manager.range_query(310, 310)), ["AAPL"])
+        self.assertEqual(self.symbols(self.manager.range_query(180, 190)), ["GOOGL", "ORCL"])
+        self.manager.delete_stock("AAPL")
+        self.assertEqual(self.symbols(self.manager.range_query(0, 1000)), ["GOOGL", "MSFT", "ORCL"])
+
+    def test_adding_known_symbol_replaces_it(self):
+        self.manager.add_stock(Stock("MSFT", "MICROSOFT CORP", 400, 450))
+        self.assertEqual(self.symbols(self.manager.range_query(100, 120)), [])
+        self.assertEqual(self.symbols(self.manager.range_query(0, 1000)), ["AAPL", "GOOGL", "MSFT", "ORCL"])
+        self.manager.add_stocks([Stock("ORCL", "ORACLE CORP", 1, 2), Stock("ORCL", "ORACLE CORP", 3, 4)])
+        self.assertEqual((self.manager.get_stock("ORCL").low, self.manager.get_stock("ORCL").high), (3, 4))
+        self.assertEqual(self.symbols(self.manager.range_query(0, 1000)), ["AAPL", "GOOGL", "MSFT", "ORCL"])
+
+if __name__ == "__main__":
+    unittest.main()
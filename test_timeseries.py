@@ -0,0 +1,161 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from datastructures.timeseries import Aggregate, ChunkAggregateTree, TimeSeries, TimeSeriesSlice
+from program import StockManager
+
+class TestTimeSeries():
+    @pytest.fixture
+    def series(self) -> TimeSeries:
+        series = TimeSeries(chunk_size=4)
+        for timestamp in [10, 20, 20, 30, 40, 40, 40, 50, 60, 70]:
+            series.append(timestamp, timestamp / 10)
+        return series
+
+    def test_len_and_last(self, series: TimeSeries) -> None:
+        assert len(series) == 10
+        assert series.last_timestamp == 70
+        assert TimeSeries().last_timestamp is None
+
+    def test_slice_is_inclusive_across_chunks(self, series: TimeSeries) -> None:
+        window = series.slice(20, 40)
+        assert [timestamp for timestamp, _ in window] == [20, 20, 30, 40, 40, 40]
+        assert len(window) == 6
+        assert list(window.prices()) == [2.0, 2.0, 3.0, 4.0, 4.0, 4.0]
+
+    def test_open_bounds(self, series: TimeSeries) -> None:
+        assert list(series.slice().timestamps()) == [10, 20, 20, 30, 40, 40, 40, 50, 60, 70]
+        assert list(series.slice(start=55).timestamps()) == [60, 70]
+        assert list(series.slice(end=15).timestamps()) == [10]
+        assert len(series.slice(71, 100)) == 0
+        assert len(series.slice(41, 49)) == 0
+
+    def test_slice_is_zero_copy_and_survives_appends(self, series: TimeSeries) -> None:
+        window = series.slice(60, 70)
+        for timestamp in range(80, 200, 10):
+            series.append(timestamp, 0.0)
+        (timestamps, _, _), = window.chunks()
+        assert timestamps.obj is series._chunks[2].timestamps
+        assert list(timestamps) == [60, 70]
+
+    def test_rejects_out_of_order(self, series: TimeSeries) -> None:
+        with pytest.raises(ValueError):
+            series.append(69, 1.0)
+        series.append(70, 1.0)
+
+    def test_extend_matches_append(self, series: TimeSeries) -> None:
+        rng = random.Random(5)
+        appended = TimeSeries(chunk_size=4)
+        for timestamp, price in series.slice():
+            appended.append(timestamp, price)
+        for start, stop, size in ((70, 100, 3), (100, 500, 40)):
+            timestamps = sorted(rng.randrange(start, stop) for _ in range(size))
+            prices = [rng.uniform(1, 9) for _ in range(size)]
+            for timestamp, price in zip(timestamps, prices):
+                appended.append(timestamp, price, 2.0)
+            series.extend(timestamps, prices, [2.0] * size)
+            assert list(series.slice()) == list(appended.slice())
+            assert series.aggregate(60, 400).count == appended.aggregate(60, 400).count
+            assert series.aggregate(60, 400).vwap == pytest.approx(appended.aggregate(60, 400).vwap)
+        with pytest.raises(ValueError):
+            series.extend(list(range(500, 480, -1)), [1.0] * 20, [1.0] * 20)
+        assert len(series) == 53
+
+    def test_empty_slice(self) -> None:
+        assert list(TimeSeriesSlice([]).prices()) == []
+
+class TestMarketTrends():
+    def test_track_market_trends(self) -> None:
+        manager = StockManager()
+        for second, price in enumerate([100, 101, 99, 105]):
+            manager._add_price_data("GOOGL", price, second * 1_000_000_000)
+        assert [price for _, price in manager.track_market_trends("GOOGL", 1_000_000_000, 2_000_000_000)] == [101, 99]
+        assert len(manager.track_market_trends("GOOGL")) == 4
+        assert len(manager.track_market_trends("AAPL")) == 0
+
+    def test_wall_clock_ticks_and_datetime_bounds(self) -> None:
+        manager = StockManager()
+        before = datetime.now()
+        manager._add_price_data("GOOGL", 100)
+        manager._add_price_data("GOOGL", 101)
+        assert [price for _, price in manager.track_market_trends("GOOGL", before, datetime.now())] == [100, 101]
+
+class TestAggregates():
+    @pytest.fixture
+    def ticks(self) -> list:
+        rng = random.Random(351)
+        timestamp, ticks = 0, []
+        for _ in range(1000):
+            timestamp += rng.choice([0, 1, 5, 40])
+            ticks.append((timestamp, float(rng.randrange(50, 150)), float(rng.randrange(1, 10))))
+        return ticks
+
+    @pytest.fixture
+    def series(self, ticks: list) -> TimeSeries:
+        series = TimeSeries(chunk_size=16)
+        for tick in ticks:
+            series.append(*tick)
+        return series
+
+    def _expected(self, ticks: list) -> tuple:
+        prices = [price for _, price, _ in ticks]
+        return (len(prices), sum(prices), min(prices), max(prices),
+                sum(price * volume for _, price, volume in ticks) / sum(volume for _, _, volume in ticks))
+
+    def test_aggregate_matches_scan(self, ticks: list, series: TimeSeries) -> None:
+        rng = random.Random(7)
+        last = ticks[-1][0]
+        for _ in range(300):
+            start, end = sorted(rng.randrange(-10, last + 10) for _ in range(2))
+            window = [tick for tick in ticks if start <= tick[0] <= end]
+            summary = series.aggregate(start, end)
+            if not window:
+                assert summary.count == 0 and summary.vwap is None
+                continue
+            count, total, low, high, vwap = self._expected(window)
+            assert (summary.count, summary.low, summary.high) == (count, low, high)
+            assert summary.total == pytest.approx(total)
+            assert summary.vwap == pytest.approx(vwap)
+
+    def test_aggregate_is_not_aliased(self, series: TimeSeries) -> None:
+        summary = series.aggregate(start=series.last_timestamp)
+        count = summary.count
+        series.append(series.last_timestamp, 1.0)
+        assert summary.count == count
+
+    def test_chunk_tree_matches_every_range(self) -> None:
+        tree = ChunkAggregateTree()
+        for key in range(40):
+            summary = Aggregate()
+            summary.add(float(key), 1.0)
+            tree.insert(key, summary)
+        for lo in range(40):
+            for hi in range(lo, 40):
+                summary = tree.aggregate(lo, hi)
+                assert (summary.count, summary.total, summary.low, summary.high) == (hi - lo + 1, sum(range(lo, hi + 1)), lo, hi)
+
+    def test_ohlc(self, ticks: list, series: TimeSeries) -> None:
+        bars = list(series.ohlc(100, start=50))
+        expected = {}
+        for timestamp, price, volume in ticks:
+            if timestamp >= 50:
+                expected.setdefault(timestamp // 100 * 100, []).append((price, volume))
+        assert [bar.start for bar in bars] == sorted(expected)
+        for bar in bars:
+            group = expected[bar.start]
+            prices = [price for price, _ in group]
+            assert (bar.open, bar.close, bar.low, bar.high, bar.count) == (prices[0], prices[-1], min(prices), max(prices), len(prices))
+            assert bar.volume == sum(volume for _, volume in group)
+
+    def test_stock_manager_aggregate_and_bars(self) -> None:
+        manager = StockManager()
+        for second, (price, volume) in enumerate([(100, 1), (110, 3), (90, 1), (120, 5)]):
+            manager._add_price_data("GOOGL", price, second * 1_000_000_000, volume)
+        summary = manager.aggregate("GOOGL", 1_000_000_000)
+        assert (summary.count, summary.low, summary.high, summary.vwap) == (3, 90, 120, (330 + 90 + 600) / 9)
+        bars = list(manager.ohlc("GOOGL", timedelta(seconds=2)))
+        assert [(bar.open, bar.high, bar.low, bar.close) for bar in bars] == [(100, 110, 100, 110), (90, 120, 90, 120)]
+        assert manager.aggregate("AAPL").count == 0
+        assert list(manager.ohlc("AAPL", 1)) == []
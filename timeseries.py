@@ -0,0 +1,316 @@
+from __future__ import annotations
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import islice
+from operator import gt, mul
+from typing import Iterator, List, Optional, Sequence, Tuple
+from datastructures.avltree import AVLTree
+
+
+@dataclass(slots=True)
+class Aggregate:
+    count: int = 0
+    total: float = 0.0
+    low: float = float('inf')
+    high: float = float('-inf')
+    volume: float = 0.0
+    notional: float = 0.0  # sum of price * volume
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def vwap(self) -> Optional[float]:
+        return self.notional / self.volume if self.volume else None
+
+    def add(self, price: float, volume: float) -> None:
+        self.count += 1
+        self.total += price
+        self.low = min(self.low, price)
+        self.high = max(self.high, price)
+        self.volume += volume
+        self.notional += price * volume
+
+    def merge(self, other: Aggregate) -> Aggregate:
+        return Aggregate(self.count + other.count, self.total + other.total, min(self.low, other.low),
+                         max(self.high, other.high), self.volume + other.volume, self.notional + other.notional)
+
+    @classmethod
+    def of(cls, prices: memoryview, volumes: memoryview) -> Aggregate:
+        if not len(prices):
+            return cls()
+        return cls(len(prices), sum(prices), min(prices), max(prices), sum(volumes), sum(map(mul, prices, volumes)))
+
+
+@dataclass(slots=True)
+class Bar:
+    start: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    count: int
+
+
+@dataclass(slots=True)
+class ChunkSummary:
+    own: Aggregate
+    subtree: Aggregate
+
+
+class ChunkAggregateTree(AVLTree[int, ChunkSummary]):
+    # Chunk number -> summary of that chunk, with every node also caching
+    # the aggregate of its whole subtree, so any run of chunks is summed from
+    # O(log n) nodes. Snapshots would share the cached subtree aggregates, so
+    # this tree is never snapshotted.
+    def insert(self, key: int, value: Aggregate) -> None:
+        super().insert(key, ChunkSummary(value, value))
+        # AVLTree.insert stops refreshing ancestors once their heights settle,
+        # so bring the subtree aggregates up to date along the whole path.
+        path = []
+        node = self._root
+        while node:
+            path.append(node)
+            if key == node.key:
+                break
+            node = node.left if key < node.key else node.right
+        for node in reversed(path):
+            self._refresh(node)
+
+    def _update(self, node) -> None:
+        super()._update(node)
+        self._refresh(node)
+
+    def _refresh(self, node) -> None:
+        subtree = node.value.own
+        for child in (node.left, node.right):
+            if child:
+                subtree = subtree.merge(child.value.subtree)
+        node.value.subtree = subtree
+
+    def aggregate(self, lo: int, hi: int) -> Aggregate:
+        # Sum over keys in [lo, hi]: find the first node inside the range,
+        # then take whole subtrees hanging inside each boundary path.
+        result = Aggregate()
+        node = self._root
+        while node and not lo <= node.key <= hi:
+            node = node.right if node.key < lo else node.left
+        if not node:
+            return result
+        result = result.merge(node.value.own)
+        left, right = node.left, node.right
+        while left:
+            if left.key >= lo:
+                result = result.merge(left.value.own)
+                if left.right:
+                    result = result.merge(left.right.value.subtree)
+                left = left.left
+            else:
+                left = left.right
+        while right:
+            if right.key <= hi:
+                result = result.merge(right.value.own)
+                if right.left:
+                    result = result.merge(right.left.value.subtree)
+                right = right.right
+            else:
+                right = right.left
+        return result
+
+
+class Chunk:
+    # Fixed-capacity column buffers. They are allocated full size and never
+    # resized, so memoryviews handed out by slices stay valid while appends
+    # keep filling the unused tail. summary covers the filled part.
+    __slots__ = ("timestamps", "prices", "volumes", "length", "summary")
+
+    def __init__(self, capacity: int, price_typecode: str):
+        self.timestamps = array("q", bytes(8 * capacity))
+        self.prices = array(price_typecode, bytes(array(price_typecode).itemsize * capacity))
+        self.volumes = array("d", bytes(8 * capacity))
+        self.length = 0
+        self.summary = Aggregate()
+
+
+class TimeSeriesSlice:
+    # Read-only window over a TimeSeries: one (timestamps, prices, volumes)
+    # triple of memoryviews per chunk it spans. Nothing is copied until asked
+    # for.
+    def __init__(self, parts: List[Tuple[memoryview, memoryview, memoryview]]):
+        self._parts = parts
+
+    def __len__(self) -> int:
+        return sum(len(timestamps) for timestamps, _, _ in self._parts)
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        for timestamps, prices, _ in self._parts:
+            yield from zip(timestamps, prices)
+
+    def chunks(self) -> Iterator[Tuple[memoryview, memoryview, memoryview]]:
+        return iter(self._parts)
+
+    def timestamps(self) -> array:
+        return self._column(0, "q")
+
+    def prices(self) -> array:
+        return self._column(1, self._parts[0][1].format if self._parts else "d")
+
+    def volumes(self) -> array:
+        return self._column(2, "d")
+
+    def _column(self, column: int, typecode: str) -> array:
+        result = array(typecode)
+        for part in self._parts:
+            result.frombytes(part[column].cast("B"))
+        return result
+
+
+class TimeSeries:
+    # Append-only price history for one symbol. Ticks carry int64 nanosecond
+    # timestamps that never decrease and are packed into fixed-size chunks;
+    # chunk_starts is a sparse index holding each chunk's first timestamp, so
+    # a window is located with two binary searches and an append is O(1).
+    # Every full chunk's summary goes into an aggregate tree, so window
+    # aggregates only scan the two partial chunks at the window's edges.
+    def __init__(self, chunk_size: int = 4096, price_typecode: str = "d"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self._chunk_size = chunk_size
+        self._price_typecode = price_typecode
+        self._chunks: List[Chunk] = []
+        self._chunk_starts = array("q")
+        self._summaries = ChunkAggregateTree()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        if not self._chunks:
+            return None
+        chunk = self._chunks[-1]
+        return chunk.timestamps[chunk.length - 1]
+
+    def append(self, timestamp: int, price: float, volume: float = 1.0) -> None:
+        last = self.last_timestamp
+        if last is not None and timestamp < last:
+            raise ValueError(f"timestamp {timestamp} is older than the last tick {last}")
+        if not self._chunks or self._chunks[-1].length == self._chunk_size:
+            self._chunks.append(Chunk(self._chunk_size, self._price_typecode))
+            self._chunk_starts.append(timestamp)
+        chunk = self._chunks[-1]
+        chunk.timestamps[chunk.length] = timestamp
+        chunk.prices[chunk.length] = price
+        chunk.volumes[chunk.length] = volume
+        chunk.length += 1
+        chunk.summary.add(price, volume)
+        self._count += 1
+        if chunk.length == self._chunk_size:
+            self._summaries.insert(len(self._chunks) - 1, chunk.summary)
+
+    def extend(self, timestamps: Sequence[int], prices: Sequence[float], volumes: Sequence[float]) -> None:
+        # Same as appending each tick in turn, but chunks are filled and
+        # summarized a slice at a time.
+        if len(timestamps) < 16:
+            # Too few to repay converting them to arrays.
+            for tick in zip(timestamps, prices, volumes):
+                self.append(*tick)
+            return
+        last = self.last_timestamp
+        if (last is not None and timestamps[0] < last) or any(map(gt, timestamps, islice(timestamps, 1, None))):
+            raise ValueError("timestamps must not decrease")
+        timestamps = array("q", timestamps)
+        prices, volumes = array(self._price_typecode, prices), array("d", volumes)
+        start = 0
+        while start < len(timestamps):
+            if not self._chunks or self._chunks[-1].length == self._chunk_size:
+                self._chunks.append(Chunk(self._chunk_size, self._price_typecode))
+                self._chunk_starts.append(timestamps[start])
+            chunk = self._chunks[-1]
+            stop = min(start + self._chunk_size - chunk.length, len(timestamps))
+            end = chunk.length + stop - start
+            chunk.timestamps[chunk.length:end] = timestamps[start:stop]
+            chunk.prices[chunk.length:end] = prices[start:stop]
+            chunk.volumes[chunk.length:end] = volumes[start:stop]
+            chunk.summary = chunk.summary.merge(Aggregate.of(memoryview(prices)[start:stop], memoryview(volumes)[start:stop]))
+            chunk.length = end
+            self._count += stop - start
+            if chunk.length == self._chunk_size:
+                self._summaries.insert(len(self._chunks) - 1, chunk.summary)
+            start = stop
+
+    def slice(self, start: Optional[int] = None, end: Optional[int] = None) -> TimeSeriesSlice:
+        # Ticks with start <= timestamp <= end; either bound may be omitted.
+        first, last = self._position(start), self._position(end, after=True)
+        parts: List[Tuple[memoryview, memoryview, memoryview]] = []
+        while first < last:
+            number, lo = divmod(first, self._chunk_size)
+            chunk = self._chunks[number]
+            hi = min(chunk.length, lo + last - first)
+            parts.append((memoryview(chunk.timestamps)[lo:hi], memoryview(chunk.prices)[lo:hi],
+                          memoryview(chunk.volumes)[lo:hi]))
+            first += hi - lo
+        return TimeSeriesSlice(parts)
+
+    def aggregate(self, start: Optional[int] = None, end: Optional[int] = None) -> Aggregate:
+        return self._aggregate(self._position(start), self._position(end, after=True))
+
+    def ohlc(self, bucket: int, start: Optional[int] = None, end: Optional[int] = None) -> Iterator[Bar]:
+        # One bar per non-empty bucket of width bucket ns, aligned to
+        # multiples of bucket, for the ticks between start and end.
+        if bucket <= 0:
+            raise ValueError("bucket must be positive")
+        first, last = self._position(start), self._position(end, after=True)
+        while first < last:
+            timestamp, open_price = self._tick(first)
+            bucket_start = timestamp // bucket * bucket
+            stop = min(self._position(bucket_start + bucket), last)
+            summary = self._aggregate(first, stop)
+            yield Bar(bucket_start, open_price, summary.high, summary.low, self._tick(stop - 1)[1],
+                      summary.volume, summary.count)
+            first = stop
+
+    def _position(self, timestamp: Optional[int], after: bool = False) -> int:
+        # Index, over the whole series, of the first tick at or (if after)
+        # past timestamp. Every chunk but the last is full, so chunk n starts
+        # at index n * chunk_size.
+        if timestamp is None:
+            return self._count if after else 0
+        search = bisect_right if after else bisect_left
+        number = search(self._chunk_starts, timestamp) - 1
+        if number < 0:
+            return 0
+        chunk = self._chunks[number]
+        return number * self._chunk_size + search(memoryview(chunk.timestamps), timestamp, 0, chunk.length)
+
+    def _tick(self, index: int) -> Tuple[int, float]:
+        number, offset = divmod(index, self._chunk_size)
+        chunk = self._chunks[number]
+        return chunk.timestamps[offset], chunk.prices[offset]
+
+    def _aggregate(self, first: int, last: int) -> Aggregate:
+        # Aggregate of ticks [first, last): the partial chunks at either end
+        # are summed directly, the full chunks between come from the tree.
+        if first >= last:
+            return Aggregate()
+        first_chunk, last_chunk = first // self._chunk_size, (last - 1) // self._chunk_size
+        # Start from a fresh Aggregate: a whole chunk's summary is returned
+        # as is and must not be handed out, the open chunk's keeps changing.
+        result = Aggregate().merge(self._chunk_aggregate(first_chunk, first, last))
+        if last_chunk != first_chunk:
+            result = result.merge(self._chunk_aggregate(last_chunk, first, last))
+        if last_chunk - first_chunk > 1:
+            result = result.merge(self._summaries.aggregate(first_chunk + 1, last_chunk - 1))
+        return result
+
+    def _chunk_aggregate(self, number: int, first: int, last: int) -> Aggregate:
+        chunk = self._chunks[number]
+        lo = max(first - number * self._chunk_size, 0)
+        hi = min(last - number * self._chunk_size, chunk.length)
+        if lo == 0 and hi == chunk.length:
+            return chunk.summary
+        return Aggregate.of(memoryview(chunk.prices)[lo:hi], memoryview(chunk.volumes)[lo:hi])